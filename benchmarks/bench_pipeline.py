@@ -0,0 +1,221 @@
+"""End-to-end pipeline benchmarks against a local synthetic wiki.
+
+Each case runs in its own subprocess (so peak RSS is per case) against the
+server from ``wiki_server.py`` and reports wall/CPU time, pages/sec, p50/p99
+fetch latency and peak RSS. Every case runs ``--repeats`` times and each
+metric is the median across repeats. Results are compared with
+``baselines.json``: a case regresses when a gated metric is worse than its
+baseline by more than ``--tolerance``. p99 latency is reported but not
+gated, since with a few dozen fetches it is effectively the slowest one.
+Baselines are machine-specific: refresh them with ``--save-baseline`` on
+the machine that runs the comparison.
+
+    python3 benchmarks/bench_pipeline.py
+    python3 benchmarks/bench_pipeline.py --case auto_count_words --latency 0.02
+    python3 benchmarks/bench_pipeline.py --save-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from wiki_server import SyntheticWiki, WikiConfig  # noqa: E402
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+CASES = ["auto_count_words", "count_words", "table", "analyze_relative_word_frequency"]
+BATCH_PAGES = 50
+
+# Gated metrics: metric -> True when higher is better. fetch_p99_ms is reported only.
+METRICS = {
+    "wall_seconds": False,
+    "cpu_seconds": False,
+    "pages_per_second": True,
+    "fetch_p50_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def _run_case(case: str, base_url: str, depth: int) -> dict:
+    """Worker side: run one case in the current (temporary) directory."""
+
+    from wiki_scraper.controller import ControllerConfig, WikiController
+    from wiki_scraper.scraper import Scraper
+
+    fetch_ms: list[float] = []
+    original = Scraper._fetch_remote_html
+
+    def timed_fetch(self: Scraper) -> str:
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            fetch_ms.append((time.perf_counter() - start) * 1000.0)
+
+    Scraper._fetch_remote_html = timed_fetch  # type: ignore[method-assign]
+    controller = WikiController(ControllerConfig(base_url=base_url))
+    phrases = [f"Page_{i}" for i in range(BATCH_PAGES)]
+
+    if case == "analyze_relative_word_frequency":
+        with contextlib.redirect_stdout(io.StringIO()):
+            for phrase in phrases:
+                controller.count_words(phrase)
+        fetch_ms.clear()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if case == "auto_count_words":
+            pages = controller.auto_count_words("Page_0", depth=depth, wait_seconds=0).pages
+        elif case == "count_words":
+            for phrase in phrases:
+                controller.count_words(phrase)
+            pages = len(phrases)
+        elif case == "table":
+            for phrase in phrases:
+                controller.table(phrase, number=1, first_row_is_header=True)
+            pages = len(phrases)
+        elif case == "analyze_relative_word_frequency":
+            controller.analyze_relative_word_frequency(
+                mode="article", count=50, language_code="en", chart_path="chart.png"
+            )
+            pages = 0
+        else:
+            raise ValueError(f"Unknown case: {case}")
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "pages": pages,
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "pages_per_second": round(pages / wall, 2) if pages and wall else 0.0,
+        "fetch_p50_ms": round(_percentile(fetch_ms, 50), 2),
+        "fetch_p99_ms": round(_percentile(fetch_ms, 99), 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+    }
+
+
+def _spawn(case: str, base_url: str, depth: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--worker",
+                case,
+                "--base-url",
+                base_url,
+                "--depth",
+                str(depth),
+            ],
+            cwd=tmp,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{case} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _median_run(case: str, base_url: str, depth: int, repeats: int) -> dict:
+    runs = [_spawn(case, base_url, depth) for _ in range(repeats)]
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def _compare(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for case, metrics in results.items():
+        base = baselines.get(case)
+        if not base:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            worse = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{case}.{metric}: {old} -> {new}")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--case", action="append", choices=CASES, help="Run only these cases.")
+    arg_parser.add_argument("--pages", type=int, default=200, help="Synthetic wiki size.")
+    arg_parser.add_argument("--paragraphs", type=int, default=30, help="Paragraphs per page.")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Server latency (s).")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 503 replies.")
+    arg_parser.add_argument("--depth", type=int, default=2, help="Crawl depth for auto_count_words.")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Runs per case (median).")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25)
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    arg_parser.add_argument("--worker", choices=CASES, help=argparse.SUPPRESS)
+    arg_parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_case(args.worker, args.base_url, args.depth)))
+        return 0
+
+    config = WikiConfig(
+        pages=args.pages,
+        paragraphs=args.paragraphs,
+        latency_seconds=args.latency,
+        error_rate=args.error_rate,
+    )
+    results: dict[str, dict] = {}
+    with SyntheticWiki(config) as wiki:
+        for case in args.case or CASES:
+            results[case] = _median_run(case, wiki.base_url, args.depth, max(1, args.repeats))
+            row = "  ".join(f"{k}={v}" for k, v in results[case].items())
+            print(f"{case:>32}: {row}")
+
+    if args.save_baseline:
+        stored = json.loads(BASELINES_PATH.read_text(encoding="utf-8")) if BASELINES_PATH.exists() else {}
+        stored.setdefault("cases", {}).update(results)
+        stored["machine"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        }
+        BASELINES_PATH.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baseline: {BASELINES_PATH}")
+        return 0
+
+    if not BASELINES_PATH.exists():
+        print("No baseline stored; run with --save-baseline first.")
+        return 0
+    baselines = json.loads(BASELINES_PATH.read_text(encoding="utf-8")).get("cases", {})
+    regressions = _compare(results, baselines, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
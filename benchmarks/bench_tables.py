@@ -0,0 +1,96 @@
+"""Benchmark: native table extraction vs. the pandas.read_html round trip.
+
+By default a synthetic table shaped like Bulbapedia's National Pokédex lists
+(~1000 rows, sprite/link cells, colspan for single-typed species) is used.
+Pass ``--html PATH`` to benchmark every table of a saved article instead.
+
+    python3 benchmarks/bench_tables.py
+    python3 benchmarks/bench_tables.py --html pokedex.html --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from wiki_scraper import parser
+from wiki_scraper.tables import html_table_to_dataframe
+
+TYPES = ["Grass", "Poison", "Fire", "Flying", "Water", "Bug", "Normal", "Electric"]
+
+
+def synthetic_pokedex_html(rows: int = 1025) -> str:
+    out = [
+        "<html><body><div class='mw-parser-output'><table class='roundy'>",
+        "<tr><th>Ndex</th><th>MS</th><th>Pokémon</th><th colspan='2'>Type</th>"
+        "<th>HP</th><th>Attack</th><th>Defense</th><th>Speed</th></tr>",
+    ]
+    for i in range(1, rows + 1):
+        first = TYPES[i % len(TYPES)]
+        second = TYPES[(i * 3) % len(TYPES)]
+        types = (
+            f"<td colspan='2'><a href='/wiki/{first}_(type)'><span>{first}</span></a></td>"
+            if i % 3 == 0
+            else f"<td><a href='/wiki/{first}_(type)'>{first}</a></td>"
+            f"<td><a href='/wiki/{second}_(type)'>{second}</a></td>"
+        )
+        out.append(
+            f"<tr><td>#{i:04d}</td>"
+            f"<td><a href='/wiki/File:{i:04d}MS.png'><img alt='P{i}' src='/m/{i:04d}MS.png' "
+            f"width='40' height='40'></a></td>"
+            f"<td><a href='/wiki/Pokemon_{i}' title='Pokémon {i}'>Pokémon {i}</a></td>"
+            f"{types}<td>{40 + i % 90}</td><td>{1000 + i:,}</td><td>{30 + i % 70}</td>"
+            f"<td>{20 + i % 110}</td></tr>"
+        )
+    out.append("</table></div></body></html>")
+    return "\n".join(out)
+
+
+def read_html_round_trip(table, *, first_row_is_header: bool) -> pd.DataFrame:
+    """Previous implementation: serialize the Tag and let read_html re-parse it."""
+
+    header = 0 if first_row_is_header else None
+    html_io = StringIO(str(table))
+    try:
+        frames = pd.read_html(html_io, header=header, index_col=0)
+    except ValueError:
+        html_io.seek(0)
+        frames = pd.read_html(html_io, header=header)
+    return frames[0].dropna(axis=0, how="all").dropna(axis=1, how="all")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--html", help="Saved article HTML to benchmark instead.")
+    arg_parser.add_argument("--rows", type=int, default=1025, help="Synthetic table rows.")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    html = (
+        Path(args.html).read_text(encoding="utf-8")
+        if args.html
+        else synthetic_pokedex_html(args.rows)
+    )
+    tables = parser.extract_tables(parser.find_article_root(parser.parse_html(html)))
+    print(f"{len(tables)} tables, {sum(len(t.find_all('tr')) for t in tables)} rows")
+
+    for name, func in (("native", html_table_to_dataframe), ("read_html", read_html_round_trip)):
+        best = min(
+            timeit.repeat(
+                lambda: [func(t, first_row_is_header=False) for t in tables],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(f"{name:>10}: {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Local stand-in for the wiki used by the benchmarks.
+
+Serves a synthetic, deterministic link graph of articles at ``/wiki/Page_<n>``.
+Every page reuses the page chrome of ``tests/fixtures/team_rocket_real.html``
+(head, navigation, footer) with generated article content: paragraphs, links
+to other pages and a stats table. Latency, page size and error rate are
+configurable so the crawler can be measured under realistic conditions
+without touching the real site.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup
+
+FIXTURE = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "team_rocket_real.html"
+CONTENT_MARKER = "@@CONTENT@@"
+
+WORDS = (
+    "team rocket giovanni jessie james meowth pokemon trainer battle gym badge "
+    "kanto johto league champion grunt admin hideout tower radio silph the of and "
+    "to in a is was that for on with as by his her their from at which"
+).split()
+
+
+@dataclass(frozen=True)
+class WikiConfig:
+    pages: int = 200
+    links_per_page: int = 20
+    paragraphs: int = 30
+    words_per_paragraph: int = 80
+    table_rows: int = 40
+    latency_seconds: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+@lru_cache(maxsize=1)
+def _template() -> str:
+    soup = BeautifulSoup(FIXTURE.read_text(encoding="utf-8"), "lxml")
+    root = soup.select_one("div.mw-parser-output")
+    assert root is not None, "fixture has no article content"
+    root.clear()
+    root.append(CONTENT_MARKER)
+    return str(soup)
+
+
+def render_page(number: int, config: WikiConfig) -> str:
+    rng = random.Random(config.seed * 1_000_003 + number)
+    parts = []
+    for _ in range(config.paragraphs):
+        words = [rng.choice(WORDS) for _ in range(config.words_per_paragraph)]
+        words[0] = words[0].capitalize()
+        parts.append(f"<p>{' '.join(words)}.</p>")
+
+    targets = [rng.randrange(config.pages) for _ in range(config.links_per_page)]
+    parts.append(
+        "<ul>"
+        + "".join(f'<li><a href="/wiki/Page_{t}" title="Page {t}">Page {t}</a></li>' for t in targets)
+        + '<li><a href="/wiki/File:Sprite.png">File</a></li></ul>'
+    )
+
+    rows = "".join(
+        f"<tr><th>{rng.choice(WORDS).title()} {i}</th><td>{rng.randrange(1, 255)}</td>"
+        f"<td>{rng.randrange(1, 255)}</td><td>{rng.choice(WORDS)}</td></tr>"
+        for i in range(config.table_rows)
+    )
+    parts.append(
+        '<table class="roundy"><tr><th>Name</th><th>HP</th><th>Attack</th><th>Type</th></tr>'
+        f"{rows}</table>"
+    )
+    return _template().replace(CONTENT_MARKER, "\n".join(parts))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_WikiHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        config = self.server.config
+        if config.latency_seconds:
+            time.sleep(config.latency_seconds)
+        with self.server.lock:
+            fail = self.server.rng.random() < config.error_rate
+
+        path = unquote(self.path.split("?", 1)[0])
+        number = None
+        if path.startswith("/wiki/Page_"):
+            try:
+                number = int(path[len("/wiki/Page_") :])
+            except ValueError:
+                number = None
+
+        if fail:
+            self.send_error(503)
+            return
+        if number is None or not 0 <= number < config.pages:
+            self.send_error(404)
+            return
+
+        body = render_page(number, config).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _WikiHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: WikiConfig) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+
+
+class SyntheticWiki:
+    """Context manager running the synthetic wiki on a free local port."""
+
+    def __init__(self, config: WikiConfig | None = None) -> None:
+        self.config = config or WikiConfig()
+        self._server: _WikiHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server is not running"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "SyntheticWiki":
+        _template()
+        self._server = _WikiHTTPServer(self.config)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
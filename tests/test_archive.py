@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper.archive import PageArchiveReader, PageArchiveWriter
+from wiki_scraper.scraper import Scraper
+
+
+class _FakeResponse:
+    status_code = 200
+    apparent_encoding = "utf-8"
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers: dict[str, str] = {}
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.urls: list[str] = []
+
+    def get(self, url: str, timeout: int) -> _FakeResponse:
+        self.urls.append(url)
+        return _FakeResponse(f"<html><body><p>Page {url} – zażółć</p></body></html>")
+
+
+class TestArchive(unittest.TestCase):
+    def test_fetched_pages_are_archived_and_replayed_without_network(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "crawl.warc.gz")
+            writer = PageArchiveWriter(path)
+            session = _FakeSession()
+            fetched = {}
+            for phrase in ("Team Rocket", "Jessie"):
+                scraper = Scraper("https://wiki.example", phrase, session=session, archive=writer)
+                fetched[phrase] = scraper.fetch_html()
+            self.assertEqual(writer.records_written, 2)
+
+            reader = PageArchiveReader(path)
+            offline = _FakeSession()
+            for phrase in ("Jessie", "Team Rocket"):
+                scraper = Scraper(
+                    "https://wiki.example", phrase, session=offline, replay_archive=reader
+                )
+                self.assertEqual(scraper.fetch_html(), fetched[phrase])
+            self.assertEqual(offline.urls, [])
+
+            missing = Scraper("https://wiki.example", "Meowth", replay_archive=reader)
+            with self.assertRaises(ValueError):
+                missing.fetch_html()
+
+
+if __name__ == "__main__":
+    unittest.main()
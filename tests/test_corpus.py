@@ -0,0 +1,33 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper.corpus import CorpusWriter, iter_pages, load_corpus, ngrams
+
+
+class TestCorpus(unittest.TestCase):
+    def test_ngrams(self) -> None:
+        words = ["team", "rocket", "blasts", "off"]
+        self.assertEqual(ngrams(words, 2), ["team rocket", "rocket blasts", "blasts off"])
+        self.assertEqual(ngrams(words, 5), [])
+
+    def test_writer_appends_pages_and_reader_roundtrips(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with CorpusWriter(tmp, max_ngram=2) as writer:
+                writer.add_page("Team Rocket", ["team", "rocket", "team", "rocket"])
+            with CorpusWriter(tmp, max_ngram=2) as writer:
+                self.assertEqual(writer.add_page("Jessie", ["jessie", "team"]), 1)
+
+            corpus = load_corpus(tmp)
+            self.assertEqual(corpus.phrases, ["Team Rocket", "Jessie"])
+            self.assertEqual(corpus.term_counts(1), {"team": 3, "rocket": 2, "jessie": 1})
+            self.assertEqual(corpus.term_counts(2)["team rocket"], 2)
+            self.assertEqual(corpus.page_counts(1), {"jessie": 1, "team": 1, "jessie team": 1})
+            self.assertEqual([p for p, _ in iter_pages(corpus)], ["Team Rocket", "Jessie"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper.archive import PageArchiveWriter
+from wiki_scraper.controller import ControllerConfig, WikiController
+from wiki_scraper.crawl import GracefulStop, load_frontier
+from wiki_scraper.extraction_cache import PageExtraction
+from wiki_scraper.scraper import Scraper
+from wiki_scraper.utils import build_article_url
+from wiki_scraper.words import load_word_counts
+
+BASE_URL = "https://wiki.example"
+
+PAGES = {
+    "Team Rocket": 'rocket <a href="/wiki/Meowth">Meowth</a> <a href="/wiki/Jessie">Jessie</a>',
+    "Meowth": "meowth rocket",
+    "Jessie": "jessie",
+}
+
+
+def _page(body: str) -> str:
+    return f'<html><body><div class="mw-parser-output"><p>{body}</p></div></body></html>'
+
+
+class _UnavailableResponse:
+    status_code = 503
+    content = b""
+    headers: dict[str, str] = {}
+
+
+class _UnavailableSession:
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.timeouts: list[float] = []
+
+    def get(self, url: str, timeout: float, **kwargs) -> _UnavailableResponse:
+        self.timeouts.append(timeout)
+        return _UnavailableResponse()
+
+
+class TestCrawlBudgets(unittest.TestCase):
+    def test_page_budget_saves_frontier_and_resume_finishes_crawl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = str(Path(tmp) / "pages.warc.gz")
+            writer = PageArchiveWriter(archive)
+            for phrase, body in PAGES.items():
+                writer.write(build_article_url(BASE_URL, phrase, "/wiki/"), _page(body))
+
+            controller = WikiController(
+                ControllerConfig(base_url=BASE_URL, replay_archive_path=archive)
+            )
+            controller._word_counts_path = str(Path(tmp) / "word-counts.json")
+            controller._frontier_path = str(Path(tmp) / "crawl-frontier.json")
+
+            first = controller.auto_count_words("Team Rocket", depth=1, wait_seconds=0, max_pages=1)
+            self.assertEqual((first.pages, first.queued, first.stop_reason), (1, 2, "max-pages"))
+            frontier = load_frontier(controller._frontier_path)
+            self.assertEqual(frontier.visited, ["team rocket"])
+
+            with self.assertRaisesRegex(ValueError, "--depth 1 \\(now 0\\)"):
+                controller.auto_count_words("Team Rocket", depth=0, wait_seconds=0, resume=True)
+            with self.assertRaisesRegex(ValueError, "--crawl-order bfs \\(now in-degree\\)"):
+                controller.auto_count_words(
+                    "Team Rocket", depth=1, wait_seconds=0, resume=True, crawl_order="in-degree"
+                )
+            second = controller.auto_count_words("team rocket", depth=1, wait_seconds=0, resume=True)
+            self.assertTrue(second.complete)
+            self.assertEqual(second.pages, 2)
+            self.assertFalse(Path(controller._frontier_path).exists())
+            self.assertEqual(
+                load_word_counts(controller._word_counts_path),
+                {"rocket": 2, "meowth": 2, "jessie": 2},
+            )
+
+    def test_request_deadline_must_be_positive(self) -> None:
+        with self.assertRaisesRegex(ValueError, "request-deadline must be > 0"):
+            WikiController(ControllerConfig(base_url=BASE_URL, request_deadline_seconds=0))
+
+    def test_request_deadline_stops_retries(self) -> None:
+        session = _UnavailableSession()
+        scraper = Scraper(
+            BASE_URL,
+            "Team Rocket",
+            session=session,  # type: ignore[arg-type]
+            max_retries=5,
+            retry_backoff_seconds=0.05,
+            deadline_seconds=0.12,
+        )
+        with self.assertRaisesRegex(ValueError, "deadline exceeded"):
+            scraper.fetch_html()
+        self.assertLess(len(session.timeouts), 6)
+        self.assertTrue(all(t <= 0.12 for t in session.timeouts))
+
+    def _interrupted_crawl(self, tmp: str, failure: BaseException, **budget):
+        def fake_fetch(phrase: str, **kwargs):
+            if phrase == "B":
+                time.sleep(0.05)
+                raise failure
+            links = ["/wiki/B", "/wiki/C"] if phrase == "A" else []
+            extraction = PageExtraction(text=phrase.lower(), first_paragraph="", links=links)
+            return extraction, SimpleNamespace(bytes_fetched=10, etag=None)
+
+        controller = WikiController(ControllerConfig(base_url=BASE_URL))
+        controller._word_counts_path = str(Path(tmp) / "word-counts.json")
+        controller._frontier_path = str(Path(tmp) / "crawl-frontier.json")
+        with mock.patch.object(controller, "_fetch_page", side_effect=fake_fetch):
+            return controller, controller.auto_count_words("A", depth=1, wait_seconds=0, **budget)
+
+    def test_page_cut_off_by_deadline_is_requeued(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            controller, result = self._interrupted_crawl(
+                tmp, ValueError("Fetch deadline exceeded"), deadline_seconds=0.03
+            )
+            self.assertEqual((result.pages, result.failed, result.stop_reason), (1, 0, "deadline"))
+            frontier = load_frontier(controller._frontier_path)
+            self.assertEqual(frontier.queue, [("B", 1), ("C", 1)])
+            self.assertEqual(frontier.visited, ["a"])
+
+    def test_frontier_is_saved_when_crawl_aborts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(KeyboardInterrupt):
+                self._interrupted_crawl(tmp, KeyboardInterrupt())
+            frontier = load_frontier(str(Path(tmp) / "crawl-frontier.json"))
+            self.assertEqual(frontier.queue, [("B", 1), ("C", 1)])
+            self.assertEqual(frontier.visited, ["a"])
+
+
+    def test_wait_between_pages_ends_at_deadline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            controller = WikiController(ControllerConfig(base_url=BASE_URL))
+            controller._word_counts_path = str(Path(tmp) / "word-counts.json")
+            controller._frontier_path = str(Path(tmp) / "crawl-frontier.json")
+            extraction = PageExtraction(text="a", first_paragraph="", links=["/wiki/B"])
+            fetched = (extraction, SimpleNamespace(bytes_fetched=10, etag=None))
+            started = time.monotonic()
+            with mock.patch.object(controller, "_fetch_page", return_value=fetched):
+                result = controller.auto_count_words(
+                    "A", depth=1, wait_seconds=3, deadline_seconds=0.2
+                )
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertEqual((result.pages, result.stop_reason), (1, "deadline"))
+
+    def test_stop_signal_interrupts_wait(self) -> None:
+        with GracefulStop() as stop:
+            threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM)).start()
+            started = time.monotonic()
+            self.assertTrue(stop.wait(5))
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertEqual(stop.requested, "SIGTERM")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper import extraction_cache
+from wiki_scraper.extraction_cache import ExtractionCache, extract_page
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.html = Path("tests/fixtures/team_rocket_minimal.html").read_text(encoding="utf-8")
+
+    def test_extract_page_collects_all_command_inputs(self) -> None:
+        extraction = extract_page(self.html, tables=True)
+        self.assertTrue(extraction.first_paragraph.startswith("Team Rocket"))
+        self.assertIn("Team Rocket", extraction.text)
+        self.assertTrue(all(href.startswith("/wiki/") for href in extraction.links))
+        self.assertEqual(len(extraction.tables), 2)
+
+    def test_memory_and_disk_hits_skip_parsing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(directory=tmp)
+            first = cache.get_or_extract(self.html)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertIs(cache.get_or_extract(self.html), first)
+
+            with mock.patch.object(extraction_cache, "extract_page", side_effect=AssertionError):
+                reloaded = ExtractionCache(directory=tmp).get_or_extract(self.html)
+            self.assertEqual(reloaded, first)
+
+            with mock.patch.object(extraction_cache, "EXTRACTOR_VERSION", 999):
+                fresh = ExtractionCache(directory=tmp)
+                fresh.get_or_extract(self.html)
+                self.assertEqual(fresh.misses, 1)
+
+    def test_tables_are_extracted_only_on_request(self) -> None:
+        cache = ExtractionCache()
+        self.assertIsNone(cache.get_or_extract(self.html).tables)
+        self.assertEqual(len(cache.get_or_extract(self.html, tables=True).tables), 2)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(cache.get_or_extract(self.html).tables), 2)
+        self.assertEqual(cache.hits, 1)
+
+    def test_lru_evicts_oldest_entry(self) -> None:
+        cache = ExtractionCache(max_entries=1)
+        cache.get_or_extract("<p>one</p>")
+        cache.get_or_extract("<p>two</p>")
+        cache.get_or_extract("<p>one</p>")
+        self.assertEqual(cache.misses, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
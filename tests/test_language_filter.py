@@ -0,0 +1,65 @@
+import unittest
+from collections import Counter
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper import parser
+from wiki_scraper.language_filter import LanguageFilter, lang_confidence_score
+from wiki_scraper.words import count_words, tokenize_words
+
+try:
+    import wordfreq as _wordfreq  # unused, only for skip condition
+except Exception:
+    _wordfreq = None
+
+
+class TestLanguageFilter(unittest.TestCase):
+    def test_lang_confidence_score_ignores_one_letter_words(self) -> None:
+        language = {"the", "and", "of", "a", "i"}
+        self.assertEqual(lang_confidence_score({"the": 2, "and": 1, "rocket": 1}, language), 0.75)
+        self.assertEqual(lang_confidence_score({"a": 4, "i": 3, "zespół": 1}, language), 0.0)
+        self.assertEqual(lang_confidence_score({}, language), 0.0)
+
+    @unittest.skipIf(_wordfreq is None, "wordfreq is not installed")
+    def test_filter_accepts_english_and_skips_polish(self) -> None:
+        html = Path("tests/fixtures/team_rocket_real.html").read_text(encoding="utf-8")
+        root = parser.find_article_root(parser.parse_html(html))
+        english = count_words(tokenize_words(parser.extract_all_text(root)))
+        polish = Counter(
+            tokenize_words("To jest artykuł o zespole, który nie ma nic wspólnego z tym, co było.")
+        )
+
+        language_filter = LanguageFilter("en")
+        self.assertTrue(language_filter.accepts("Team Rocket", english))
+        self.assertFalse(language_filter.accepts("Zespół", polish))
+        self.assertEqual(language_filter.stats.checked, 2)
+        self.assertEqual(language_filter.stats.skipped_phrases, ["Zespół"])
+
+    @unittest.skipIf(_wordfreq is None, "wordfreq is not installed")
+    def test_default_threshold_separates_short_english_from_polish(self) -> None:
+        language_filter = LanguageFilter("en")
+        for text in (
+            "Meowth is a Normal-type Pokémon. It evolves into Persian starting at level 28.",
+            "Team Rocket is a criminal organization that uses Pokémon for profit. Its members "
+            "are known as grunts, and they are led by Giovanni, who is also a Gym Leader.",
+        ):
+            self.assertTrue(language_filter.accepts("en", Counter(tokenize_words(text))), text)
+        for text in (
+            "Zespół R to organizacja przestępcza, która wykorzystuje Pokémony do zarabiania "
+            "pieniędzy. Jej członkowie są znani jako szeregowcy, a przewodzi im Giovanni, "
+            "który jest także liderem sali.",
+            "Meowth jest Pokémonem typu normalnego. Ewoluuje w Persiana od poziomu 28. Jest "
+            "jednym z członków Zespołu R i potrafi mówić ludzkim językiem.",
+        ):
+            self.assertFalse(language_filter.accepts("pl", Counter(tokenize_words(text))), text)
+
+    @unittest.skipIf(_wordfreq is None, "wordfreq is not installed")
+    def test_unknown_language_fails_on_construction(self) -> None:
+        with self.assertRaisesRegex(ValueError, "xx"):
+            LanguageFilter("xx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper.link_graph import LinkGraphBuilder, load_link_graph
+
+
+class TestLinkGraph(unittest.TestCase):
+    def test_builder_round_trip_and_rankings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with LinkGraphBuilder(tmp) as builder:
+                builder.add_page("Team Rocket", ["Meowth", "Jessie", "Meowth", "Team Rocket"])
+                builder.add_page("Meowth", ["Team Rocket"])
+                builder.add_page("Jessie", ["Team Rocket", "James"])
+
+            graph = load_link_graph(tmp)
+            self.assertEqual(graph.phrases, ["Team Rocket", "Meowth", "Jessie", "James"])
+            self.assertEqual(graph.indptr.tolist(), [0, 2, 3, 5, 5])
+            self.assertEqual(graph.in_degree().tolist(), [2, 1, 1, 1])
+            self.assertEqual(graph.crawled.tolist(), [True, True, True, False])
+
+            rank = graph.pagerank()
+            self.assertAlmostEqual(rank.sum(), 1.0)
+            self.assertEqual(int(np.argmax(rank)), 0)
+            self.assertEqual(graph.top(1)["phrase"][0], "Team Rocket")
+
+            # Re-opening continues the graph; a re-crawled page replaces its edges.
+            with LinkGraphBuilder(tmp) as builder:
+                builder.add_page("jessie", ["Giovanni"])
+            graph = load_link_graph(tmp)
+            self.assertEqual(graph.in_degree().tolist(), [1, 1, 1, 0, 1])
+
+    def test_pagerank_of_cycle_is_uniform(self) -> None:
+        builder = LinkGraphBuilder(None)
+        for src, dst in [("A", "B"), ("B", "C"), ("C", "A")]:
+            builder.add_page(src, [dst])
+        np.testing.assert_allclose(builder.to_graph().pagerank(), [1 / 3] * 3)
+
+    def test_frontier_pops_most_linked_page_and_rescores(self) -> None:
+        for by in ("in-degree", "pagerank"):
+            builder = LinkGraphBuilder(None)
+            builder.add_page("A", ["B", "C"])
+            builder.add_page("D", ["C"])
+            frontier = builder.frontier(by=by)
+            frontier.extend([("B", 1), ("C", 1), ("E", 1)])
+            self.assertEqual(frontier.popleft(), ("C", 1))
+            frontier.appendleft(("C", 1))
+            self.assertEqual(list(frontier), [("C", 1), ("B", 1), ("E", 1)])
+            self.assertEqual(frontier.popleft(), ("C", 1))
+            self.assertEqual(len(frontier), 2)
+
+        builder = LinkGraphBuilder(None)
+        frontier = builder.frontier(by="in-degree")
+        frontier.extend([("B", 1), ("E", 1)])
+        builder.add_page("A", ["E"])
+        self.assertEqual([frontier.popleft(), frontier.popleft()], [("E", 1), ("B", 1)])
+        with self.assertRaises(IndexError):
+            frontier.popleft()
+
+    def test_load_rejects_nodes_that_do_not_match_edges(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with LinkGraphBuilder(tmp) as builder:
+                builder.add_page("A", ["B"])
+            nodes = Path(tmp) / "nodes.json"
+            nodes.write_text('{"phrases": ["A"], "crawled": [true]}', encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_link_graph(tmp)
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["graph.npz", "nodes.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper import metrics
+from wiki_scraper.metrics import Metrics, ProgressReporter
+from wiki_scraper.words import tokenize_words
+
+
+class TestMetrics(unittest.TestCase):
+    def test_stage_timers_counters_and_reports(self) -> None:
+        registry = Metrics()
+        with registry.timer("parse_html"):
+            pass
+        registry.observe("parse_html", 0.5)
+        registry.incr("fetch.bytes", 1024)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["stages"]["parse_html"]["count"], 2)
+        self.assertEqual(snapshot["stages"]["parse_html"]["max_seconds"], 0.5)
+        self.assertEqual(snapshot["counters"], {"fetch.bytes": 1024})
+
+        prom = registry.to_prometheus()
+        self.assertIn("wiki_scraper_fetch_bytes_total 1024", prom)
+        self.assertIn('wiki_scraper_stage_seconds_count{stage="parse_html"} 2', prom)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.json"
+            registry.write_report(str(path))
+            self.assertEqual(json.loads(path.read_text())["counters"]["fetch.bytes"], 1024)
+
+    def test_pipeline_functions_record_into_registry(self) -> None:
+        metrics.REGISTRY.reset()
+        tokenize_words("Team Rocket blasts off")
+        self.assertEqual(metrics.REGISTRY.counters["words.tokens"], 4)
+        self.assertEqual(metrics.REGISTRY.stages["tokenize"].count, 1)
+
+    def test_progress_reporter_respects_interval(self) -> None:
+        stream = io.StringIO()
+        ProgressReporter(0.0, stream=stream).update(pages=1, queued=2)
+        reporter = ProgressReporter(1e-9, stream=stream)
+        reporter.update(pages=3, queued=4)
+        self.assertEqual(stream.getvalue().count("[progress]"), 1)
+        self.assertIn("3 pages", stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
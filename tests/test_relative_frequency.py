@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from unittest import mock
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper import relative_frequency
+
+LISTS = {
+    "en": {"the": 0.05, "team": 0.001, "rocket": 0.0005},
+    "pl": {"i": 0.03, "team": 0.0001},
+}
+
+
+def _fake_language_words(code, n, *, option):
+    return dict(list(LISTS[code].items())[:n])
+
+
+class TestRelativeFrequency(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(relative_frequency, "load_language_words", _fake_language_words)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_single_language_keeps_original_columns(self) -> None:
+        df = relative_frequency.analyze_relative_word_frequency(
+            {"team": 4, "rocket": 2, "meowth": 1}, language_code="en", mode="article", count=2
+        )
+        self.assertEqual(list(df.columns), ["word", "frequency_in_article", "frequency_in_language"])
+        self.assertEqual(df["word"].tolist(), ["team", "rocket"])
+        self.assertEqual(df["frequency_in_article"].tolist(), [1.0, 0.5])
+        self.assertEqual(df["frequency_in_language"].tolist(), [1.0, 0.5])
+
+    def test_several_languages_produce_one_wide_frame(self) -> None:
+        df = relative_frequency.analyze_relative_word_frequency(
+            {"team": 4, "the": 8}, language_code=["en", "pl"], mode="language", count=3
+        )
+        self.assertEqual(
+            list(df.columns),
+            ["word", "frequency_in_article", "frequency_in_en", "frequency_in_pl"],
+        )
+        self.assertEqual(df["word"].tolist(), ["the", "team", "rocket"])
+        self.assertEqual(df["frequency_in_pl"][1], 1.0)
+        self.assertTrue(df["frequency_in_pl"].isna()[[0, 2]].all())
+
+    def test_large_counts_switch_to_zipf_or_pages(self) -> None:
+        counts = {f"w{i}": 1000 - i for i in range(150)}
+        with tempfile.TemporaryDirectory() as tmp:
+            html_path = str(Path(tmp) / "chart.html")
+            df = relative_frequency.analyze_relative_word_frequency(
+                counts, language_code="en", mode="article", count=150, chart_path=html_path
+            )
+            self.assertEqual(df.attrs["chart_paths"], [html_path])
+            self.assertIn("<svg", Path(html_path).read_text(encoding="utf-8"))
+
+            df = relative_frequency.analyze_relative_word_frequency(
+                counts,
+                language_code="en",
+                mode="article",
+                count=150,
+                chart_path=str(Path(tmp) / "chart.png"),
+                chart_style="pages",
+            )
+            self.assertEqual(
+                [Path(p).name for p in df.attrs["chart_paths"]],
+                ["chart-1.png", "chart-2.png", "chart-3.png"],
+            )
+            self.assertTrue(all(Path(p).exists() for p in df.attrs["chart_paths"]))
+
+    def test_bars_and_pages_are_capped(self) -> None:
+        counts = {f"w{i}": 1000 - i for i in range(200)}
+        df = relative_frequency.analyze_relative_word_frequency(
+            counts, language_code="en", mode="article", count=200
+        )
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+            relative_frequency, "_bar_figure", wraps=relative_frequency._bar_figure
+        ) as bars, mock.patch.object(relative_frequency, "CHART_MAX_PAGES", 2), mock.patch(
+            "sys.stderr"
+        ):
+            path = str(Path(tmp) / "chart.png")
+            paths = relative_frequency._save_chart(
+                df, path, mode="article", language_codes=["en"], style="bars"
+            )
+            self.assertEqual(paths, [path])
+            bars.assert_not_called()
+
+            paths = relative_frequency._save_chart(
+                df, path, mode="article", language_codes=["en"], style="pages"
+            )
+            self.assertEqual([Path(p).name for p in paths], ["chart-1.png", "chart-2.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper import revisions
+from wiki_scraper.archive import PageArchiveWriter
+from wiki_scraper.controller import ControllerConfig, WikiController
+from wiki_scraper.revisions import PageState, PageStateLog, fetch_revision_ids, load_page_states
+from wiki_scraper.utils import build_article_url
+from wiki_scraper.words import load_word_counts
+
+BASE_URL = "https://wiki.example"
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _FakeApiSession:
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.calls: list[dict] = []
+
+    def get(self, url: str, params: dict, timeout: int) -> _FakeResponse:
+        self.calls.append(params)
+        return _FakeResponse(
+            {
+                "query": {
+                    "normalized": [{"from": "team rocket", "to": "Team rocket"}],
+                    "redirects": [{"from": "Team rocket", "to": "Team Rocket"}],
+                    "pages": [
+                        {"title": "Team Rocket", "revisions": [{"revid": 42}]},
+                        {"title": "Missing", "missing": True},
+                    ],
+                }
+            }
+        )
+
+
+def _page(revision_id: int, text: str) -> str:
+    return (
+        f'<html><head><script>RLCONF={{"wgRevisionId":{revision_id}}};</script></head>'
+        f'<body><div class="mw-parser-output"><p>{text}</p></div></body></html>'
+    )
+
+
+class TestRevisions(unittest.TestCase):
+    def test_fetch_revision_ids_follows_normalization_and_redirects(self) -> None:
+        session = _FakeApiSession()
+        revisions = fetch_revision_ids(BASE_URL, ["team rocket", "Missing"], session=session)
+        self.assertEqual(revisions, {"team rocket": 42})
+        self.assertEqual(session.calls[0]["titles"], "team rocket|Missing")
+
+    def test_refresh_replaces_changed_page_counts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = build_article_url(BASE_URL, "Team Rocket", "/wiki/")
+            first = str(Path(tmp) / "first.warc.gz")
+            second = str(Path(tmp) / "second.warc.gz")
+            PageArchiveWriter(first).write(url, _page(1, "rocket rocket team"))
+            PageArchiveWriter(second).write(url, _page(2, "rocket meowth"))
+
+            def controller(archive: str) -> WikiController:
+                config = ControllerConfig(
+                    base_url=BASE_URL, replay_archive_path=archive, track_revisions=True
+                )
+                c = WikiController(config)
+                c._word_counts_path = str(Path(tmp) / "word-counts.json")
+                c._page_states_path = str(Path(tmp) / "word-counts-pages.jsonl")
+                return c
+
+            controller(first).auto_count_words("Team Rocket", depth=0, wait_seconds=0)
+            controller(first).auto_count_words("Team Rocket", depth=0, wait_seconds=0)
+            counts_path = str(Path(tmp) / "word-counts.json")
+            self.assertEqual(load_word_counts(counts_path), {"rocket": 2, "team": 1})
+
+            unchanged = controller(first).refresh_word_counts(wait_seconds=0)
+            self.assertEqual((unchanged.unchanged, unchanged.updated), (1, 0))
+
+            result = controller(second).refresh_word_counts(wait_seconds=0)
+            self.assertEqual((result.checked, result.updated), (1, 1))
+            self.assertEqual(load_word_counts(counts_path), {"rocket": 1, "meowth": 1})
+            states = load_page_states(str(Path(tmp) / "word-counts-pages.jsonl"))
+            self.assertEqual(states["team rocket"].revision_id, 2)
+
+    def test_refresh_appends_only_changed_page_states(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "word-counts-pages.jsonl")
+            store = PageStateLog(path)
+            store.put("team rocket", PageState("Team Rocket", 1, None, {"rocket": 2}))
+            store.put("meowth", PageState("Meowth", 7, None, {"meowth": 1}))
+            before = Path(path).read_bytes()
+
+            url = build_article_url(BASE_URL, "Team Rocket", "/wiki/")
+            archive = str(Path(tmp) / "changed.warc.gz")
+            PageArchiveWriter(archive).write(url, _page(2, "rocket meowth"))
+            PageArchiveWriter(archive).write(
+                build_article_url(BASE_URL, "Meowth", "/wiki/"), _page(7, "meowth")
+            )
+            config = ControllerConfig(
+                base_url=BASE_URL, replay_archive_path=archive, track_revisions=True
+            )
+            c = WikiController(config)
+            c._word_counts_path = str(Path(tmp) / "word-counts.json")
+            c._page_states_path = path
+            result = c.refresh_word_counts(wait_seconds=0)
+            self.assertEqual((result.unchanged, result.updated), (1, 1))
+
+            after = Path(path).read_bytes()
+            self.assertTrue(after.startswith(before))
+            appended = after[len(before) :].decode("utf-8").splitlines()
+            self.assertEqual(len(appended), 1)
+            self.assertIn('"key":"team rocket"', appended[0])
+            self.assertEqual(load_page_states(path)["team rocket"].revision_id, 2)
+
+
+    def test_log_skips_torn_line_and_compacts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "word-counts-pages.jsonl"
+            store = PageStateLog(str(path))
+            for revision in (1, 2, 3):
+                store.put("meowth", PageState("Meowth", revision, None, {"meowth": revision}))
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write('{"key":"jessie","phr')
+
+            store = PageStateLog(str(path))
+            self.assertEqual((store.records, store.get("meowth").revision_id), (3, 3))
+            store.put("james", PageState("James", 1))
+            self.assertEqual(set(load_page_states(str(path))), {"meowth", "james"})
+
+            with mock.patch.object(revisions, "COMPACT_MIN_STALE", 1):
+                self.assertTrue(store.compact())
+            self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
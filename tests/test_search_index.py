@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from wiki_scraper.search_index import (
+    IndexBuilder,
+    InvertedIndex,
+    decode_postings,
+    encode_varint,
+)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_varint_postings_roundtrip(self) -> None:
+        buf = bytearray()
+        for value in (0, 5, 300, 1, 70000, 2):
+            encode_varint(value, buf)
+        self.assertEqual(decode_postings(bytes(buf)), [(0, 5), (300, 1), (70300, 2)])
+
+    def test_bm25_ranks_pages_and_index_can_be_extended(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with IndexBuilder(tmp) as builder:
+                builder.add_page("Team Rocket", Counter({"rocket": 5, "team": 3, "jessie": 1}))
+                builder.add_page("Meowth", Counter({"meowth": 4, "rocket": 1}))
+            with IndexBuilder(tmp) as builder:
+                builder.add_page("Jessie", Counter({"jessie": 6, "james": 2}))
+
+            with InvertedIndex(tmp) as index:
+                self.assertEqual(index.document_count, 3)
+                self.assertEqual(index.postings("rocket"), [(0, 5), (1, 1)])
+                hits = index.search("Rocket", count=5)
+                self.assertEqual([h.phrase for h in hits], ["Team Rocket", "Meowth"])
+                self.assertEqual(index.search("jessie", count=1)[0].phrase, "Jessie")
+                self.assertEqual(index.search("pikachu"), [])
+
+    def test_segments_are_readable_before_close(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            builder = IndexBuilder(tmp, flush_pages=2)
+            builder.add_page("Team Rocket", Counter({"rocket": 5}))
+            builder.add_page("Meowth", Counter({"rocket": 1, "meowth": 2}))
+            builder.add_page("Jessie", Counter({"rocket": 2}))
+
+            # Simulates a crash: only the flushed segment is visible.
+            with InvertedIndex(tmp) as index:
+                self.assertEqual(index.document_count, 2)
+                self.assertEqual(index.postings("rocket"), [(0, 5), (1, 1)])
+
+            builder.close()
+            with InvertedIndex(tmp) as index:
+                self.assertEqual(index.postings("rocket"), [(0, 5), (1, 1), (2, 2)])
+                self.assertEqual(sorted(p.name for p in Path(tmp).glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
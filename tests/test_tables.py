@@ -1,4 +1,6 @@
+import tempfile
 import unittest
+from io import StringIO
 from pathlib import Path
 import sys
 
@@ -33,6 +35,80 @@ class TestTables(unittest.TestCase):
         # "2" appears multiple times in the sample table.
         self.assertTrue((counts["value"] == "2").any())
 
+    def test_native_extractor_matches_read_html_on_fixtures(self) -> None:
+        import pandas as pd
+
+        from wiki_scraper.tables import html_table_to_dataframe
+
+        def read_html_reference(table, first_row_is_header: bool) -> pd.DataFrame:
+            header = 0 if first_row_is_header else None
+            html_io = StringIO(str(table))
+            try:
+                frames = pd.read_html(html_io, header=header, index_col=0)
+            except ValueError:
+                html_io.seek(0)
+                frames = pd.read_html(html_io, header=header)
+            return frames[0].dropna(axis=0, how="all").dropna(axis=1, how="all")
+
+        for fixture in ("team_rocket_minimal.html", "team_rocket_real.html"):
+            html = Path("tests/fixtures", fixture).read_text(encoding="utf-8")
+            root = parser.find_article_root(parser.parse_html(html))
+            for number, table in enumerate(parser.extract_tables(root), start=1):
+                for first_row_is_header in (False, True):
+                    with self.subTest(fixture=fixture, table=number, header=first_row_is_header):
+                        pd.testing.assert_frame_equal(
+                            html_table_to_dataframe(table, first_row_is_header=first_row_is_header),
+                            read_html_reference(table, first_row_is_header),
+                        )
+
+    def test_native_extractor_expands_spans_and_skips_hidden_cells(self) -> None:
+        from wiki_scraper.parser import extract_table_rows
+
+        html = (
+            "<table><tr><th>Name</th><th colspan='2'>Stats</th></tr>"
+            "<tr><td rowspan='2'>Bulba<br>saur</td><td>45</td><td>49</td></tr>"
+            "<tr><td>60<span style='display: none'>?</span></td><td>62</td></tr></table>"
+        )
+        table = parser.parse_html(html).find("table")
+        head, body, foot = extract_table_rows(table)
+        self.assertEqual(head, [["Name", "Stats", "Stats"]])
+        self.assertEqual(body, [["Bulba saur", "45", "49"], ["Bulba saur", "60", "62"]])
+        self.assertEqual(foot, [])
+
+    def test_long_frames_are_streamed_and_value_counts_aggregated(self) -> None:
+        import pandas as pd
+
+        from wiki_scraper.tables import (
+            TableBatchWriter,
+            compute_value_counts,
+            merge_value_counts,
+            table_to_long_frame,
+        )
+
+        first = pd.DataFrame({"a": [2, None], "b": ["x", " "]}, index=["Fire", "Water"])
+        second = pd.DataFrame({"c": ["x", "2"]})
+        long_first = table_to_long_frame(first, page="Type", table_number=1)
+        long_second = table_to_long_frame(second, page="Type", table_number=3)
+
+        self.assertEqual(long_first["row_label"].tolist(), ["Fire", "Fire"])
+        self.assertEqual(long_first["value"].tolist(), compute_value_counts(first)["value"].tolist())
+
+        counts = merge_value_counts(
+            [long_first["value"].value_counts(), long_second["value"].value_counts()]
+        )
+        self.assertEqual(dict(zip(counts["value"], counts["count"])), {"x": 2, "2.0": 1, "2": 1})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "tables.csv")
+            writer = TableBatchWriter(path)
+            writer.write(long_first)
+            writer.write(long_second)
+            writer.close()
+            saved = pd.read_csv(path)
+            self.assertEqual(saved["table"].tolist(), [1, 1, 3, 3])
+            with self.assertRaises(ValueError):
+                TableBatchWriter(str(Path(tmp) / "tables.xlsx"))
+
 
 if __name__ == "__main__":
     unittest.main()
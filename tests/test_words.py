@@ -5,7 +5,12 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from wiki_scraper.words import merge_word_counts, tokenize_words
+from wiki_scraper.words import (
+    TopKSketch,
+    merge_word_counts,
+    subtract_word_counts,
+    tokenize_words,
+)
 
 
 class TestWords(unittest.TestCase):
@@ -28,6 +33,36 @@ class TestWords(unittest.TestCase):
         self.assertEqual(merged["rocket"], 3)
         self.assertEqual(merged["hello"], 1)
 
+    def test_subtract_word_counts_drops_exhausted_words(self) -> None:
+        existing = {"team": 5, "rocket": 1}
+        self.assertEqual(subtract_word_counts(existing, {"team": 2, "rocket": 1}), {"team": 3})
+
+    def test_topk_sketch_tracks_heavy_hitters_in_fixed_capacity(self) -> None:
+        sketch = TopKSketch.create(top_k=3, epsilon=0.01, delta=0.01)
+        counts = Counter({"team": 50, "rocket": 40, "jessie": 30})
+        counts.update({f"noise{i}": 1 for i in range(200)})
+        sketch.update_counts(counts)
+
+        top = sketch.top(3)
+        self.assertEqual([w for w, _ in top], ["team", "rocket", "jessie"])
+        for word, estimate in top:
+            self.assertGreaterEqual(estimate, counts[word])
+            self.assertLessEqual(estimate, counts[word] + 0.01 * sketch.total)
+        self.assertEqual(len(sketch.top()), 3)
+
+    def test_topk_sketch_merge_and_roundtrip(self) -> None:
+        left = TopKSketch.create(top_k=5)
+        right = TopKSketch.create(top_k=5)
+        left.update_counts(Counter({"team": 3, "rocket": 1}))
+        right.update_counts(Counter({"rocket": 4, "meowth": 2}))
+
+        left.merge(TopKSketch.from_dict(right.to_dict()))
+        self.assertEqual(left.total, 10)
+        self.assertEqual(left.top(2), [("rocket", 5), ("team", 3)])
+
+        with self.assertRaises(ValueError):
+            left.merge(TopKSketch.create(top_k=5, epsilon=0.1))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
+import shlex
+import sys
 
+from wiki_scraper import metrics
 from wiki_scraper.config import DEFAULT_BASE_URL
 from wiki_scraper.controller import ControllerConfig, WikiController
+from wiki_scraper.language_filter import DEFAULT_THRESHOLD
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -25,6 +30,16 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="PHRASE",
         help="Crawl wiki links starting from a phrase and update ./word-counts.json.",
     )
+    parser.add_argument(
+        "--refresh-word-counts",
+        action="store_true",
+        help="Re-count only pages whose revision changed since --track-revisions recorded them.",
+    )
+    parser.add_argument(
+        "--track-revisions",
+        action="store_true",
+        help="Record per-page revision ids and counts (used with --auto-count-words).",
+    )
     parser.add_argument(
         "--analyze-relative-word-frequency",
         action="store_true",
@@ -35,6 +50,17 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="PHRASE",
         help="Extract N-th <table> from the article and save it to CSV.",
     )
+    parser.add_argument(
+        "--all-tables",
+        nargs="+",
+        metavar="PHRASE",
+        help="Extract every table from one or more articles into a single long-format file.",
+    )
+    parser.add_argument(
+        "--output",
+        default="tables.csv",
+        help="Output file for --all-tables: .csv (streamed), .parquet or .feather (default: tables.csv).",
+    )
     parser.add_argument(
         "--number",
         type=int,
@@ -43,7 +69,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--first-row-is-header",
         action="store_true",
-        help="Treat first row as column headers (used with --table).",
+        help="Treat first row as column headers (used with --table and --all-tables).",
     )
     parser.add_argument(
         "--depth",
@@ -53,7 +79,94 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--wait",
         type=float,
-        help="Seconds to wait between requests (used with --auto-count-words).",
+        help="Seconds to wait between requests (used with --auto-count-words and --all-tables).",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        help="Stop the crawl after this many counted pages (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        help="Stop the crawl after downloading this many bytes (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the crawl after this many seconds (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--request-deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Give up on a single page after this many seconds, retries included.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a stopped crawl from crawl-frontier.json (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--filter-language",
+        metavar="CODE",
+        help="Skip crawled pages not written in this language (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--language-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=(
+            "Minimum share of a page's words in the language's top-1000 list "
+            "for --filter-language (default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--corpus",
+        metavar="DIR",
+        help="Store per-page term counts in a compact corpus directory (used with --auto-count-words).",
+    )
+    parser.add_argument(
+        "--ngrams",
+        type=int,
+        default=1,
+        help="Highest n-gram order stored with --corpus (default: 1, unigrams only).",
+    )
+    parser.add_argument(
+        "--index",
+        metavar="DIR",
+        help="Inverted index directory built by --auto-count-words and queried by --search.",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="TERMS",
+        help="Rank crawled pages for TERMS with BM25 using --index.",
+    )
+    parser.add_argument(
+        "--link-graph",
+        metavar="DIR",
+        help="Link graph directory recorded by --auto-count-words and read by --rank-pages.",
+    )
+    parser.add_argument(
+        "--link-graph-format",
+        choices=["npz", "parquet"],
+        default="npz",
+        help="Edge storage for --link-graph: NumPy CSR arrays or a Parquet edge list (default: npz).",
+    )
+    parser.add_argument(
+        "--rank-pages",
+        choices=["pagerank", "in-degree"],
+        help="Print the top --count pages of --link-graph by PageRank or in-degree.",
+    )
+    parser.add_argument(
+        "--crawl-order",
+        choices=["bfs", "in-degree", "pagerank"],
+        default="bfs",
+        help=(
+            "Crawl the queued page with the most links (in-degree) or highest PageRank "
+            "first instead of breadth-first (used with --auto-count-words; default: bfs)."
+        ),
     )
     parser.add_argument(
         "--mode",
@@ -63,16 +176,63 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--count",
         type=int,
-        help="Number of rows (used with --analyze-relative-word-frequency).",
+        help="Number of rows (used with --analyze-relative-word-frequency and --search).",
     )
     parser.add_argument(
         "--chart",
-        help="Path to save bar chart PNG (used with --analyze-relative-word-frequency).",
+        help=(
+            "Path to save the chart; .png, .svg or .html "
+            "(used with --analyze-relative-word-frequency)."
+        ),
+    )
+    parser.add_argument(
+        "--chart-style",
+        choices=["auto", "bars", "zipf", "pages"],
+        default="auto",
+        help=(
+            "bars: up to 60 words, above that a log-rank (Zipf) plot; zipf: always the "
+            "rank plot; pages: bars over numbered files of 60 words, at most 10 files "
+            "(600 words). auto (default) behaves like bars."
+        ),
     )
     parser.add_argument(
         "--language",
-        default="en",
-        help="Language code for word frequencies (default: en).",
+        nargs="+",
+        default=["en"],
+        metavar="CODE",
+        help=(
+            "Language code(s) for word frequencies (default: en). "
+            "Several codes are compared in one table and chart."
+        ),
+    )
+    parser.add_argument(
+        "--sketch",
+        metavar="PATH",
+        help="Count words approximately into a fixed-size top-k sketch file instead of word-counts.json.",
+    )
+    parser.add_argument(
+        "--sketch-top-k",
+        type=int,
+        default=1000,
+        help="Number of heavy hitters tracked by a new --sketch (default: 1000).",
+    )
+    parser.add_argument(
+        "--sketch-epsilon",
+        type=float,
+        default=0.001,
+        help="Relative overcount bound of a new --sketch (default: 0.001).",
+    )
+    parser.add_argument(
+        "--sketch-delta",
+        type=float,
+        default=0.01,
+        help="Probability of exceeding --sketch-epsilon (default: 0.01).",
+    )
+    parser.add_argument(
+        "--merge-sketches",
+        nargs="+",
+        metavar="PATH",
+        help="Merge partial sketch files into the --sketch file.",
     )
     parser.add_argument(
         "--base-url",
@@ -88,19 +248,77 @@ def build_parser() -> argparse.ArgumentParser:
         "--local-html",
         help="Path to a local HTML file (used with --use-local-html).",
     )
+    parser.add_argument(
+        "--extraction-cache",
+        metavar="DIR",
+        help="Reuse parsed page extractions stored in DIR (keyed by HTML hash) across runs.",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between crawl progress lines on stderr; 0 disables (default: 10).",
+    )
+    parser.add_argument(
+        "--metrics-report",
+        metavar="PATH",
+        help="Write per-stage timings and counters at the end of the run (JSON, or Prometheus text for .prom).",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Write a cProfile dump of the run to PATH.",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="PATH",
+        help="Append every fetched page to a compressed WARC archive (.warc.gz).",
+    )
+    parser.add_argument(
+        "--replay-archive",
+        metavar="PATH",
+        help="Serve pages from a --archive file instead of HTTP.",
+    )
     return parser
 
 
+def _resume_command() -> str:
+    """The current command line with ``--resume`` added, so every crawl option is kept."""
+
+    argv = sys.argv[1:] if "--resume" in sys.argv[1:] else [*sys.argv[1:], "--resume"]
+    return shlex.join(["python3", sys.argv[0], *argv])
+
+
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        run(parser, args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.metrics_report:
+            metrics.REGISTRY.write_report(args.metrics_report)
+
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
     if not any(
         [
             args.summary,
             args.table,
+            args.all_tables,
             args.count_words,
             args.auto_count_words,
+            args.refresh_word_counts,
             args.analyze_relative_word_frequency,
+            args.merge_sketches,
+            args.search,
+            args.rank_pages,
         ]
     ):
         parser.print_help()
@@ -108,13 +326,41 @@ def main() -> None:
 
     if args.use_local_html and not args.local_html:
         raise SystemExit("--local-html is required with --use-local-html")
+    if args.use_local_html and args.replay_archive:
+        raise SystemExit("--use-local-html cannot be combined with --replay-archive")
+
+    if args.merge_sketches:
+        if not args.sketch:
+            raise SystemExit("--sketch is required with --merge-sketches")
+        from wiki_scraper.words import merge_sketches, save_sketch
+
+        try:
+            merged = merge_sketches(args.merge_sketches)
+            save_sketch(merged, args.sketch)
+        except Exception as exc:
+            raise SystemExit(str(exc)) from exc
+        print(f"Merged {len(args.merge_sketches)} sketches ({merged.total} words) into {args.sketch}")
+        return
 
     config = ControllerConfig(
         base_url=args.base_url,
         use_local_html_file=args.use_local_html,
         local_html_path=args.local_html,
+        sketch_path=args.sketch,
+        sketch_top_k=args.sketch_top_k,
+        sketch_epsilon=args.sketch_epsilon,
+        sketch_delta=args.sketch_delta,
+        archive_path=args.archive,
+        replay_archive_path=args.replay_archive,
+        extraction_cache_dir=args.extraction_cache,
+        track_revisions=args.track_revisions,
+        progress_interval_seconds=args.progress_interval,
+        request_deadline_seconds=args.request_deadline,
     )
-    controller = WikiController(config)
+    try:
+        controller = WikiController(config)
+    except Exception as exc:
+        raise SystemExit(str(exc)) from exc
 
     if args.summary:
         try:
@@ -129,7 +375,38 @@ def main() -> None:
             total = controller.count_words(args.count_words)
         except Exception as exc:
             raise SystemExit(str(exc)) from exc
-        print(f"Counted {total} words and updated word-counts.json")
+        print(f"Counted {total} words and updated {args.sketch or 'word-counts.json'}")
+        return
+
+    if args.search:
+        if not args.index:
+            raise SystemExit("--index is required with --search")
+        try:
+            hits = controller.search(
+                args.search,
+                index_dir=args.index,
+                count=args.count if args.count is not None else 10,
+            )
+        except Exception as exc:
+            raise SystemExit(str(exc)) from exc
+        if not hits:
+            print("No matching pages")
+        for hit in hits:
+            print(f"{hit.score:.4f}\t{hit.phrase}")
+        return
+
+    if args.rank_pages:
+        if not args.link_graph:
+            raise SystemExit("--link-graph is required with --rank-pages")
+        try:
+            df = controller.rank_pages(
+                graph_dir=args.link_graph,
+                count=args.count if args.count is not None else 10,
+                by=args.rank_pages,
+            )
+        except Exception as exc:
+            raise SystemExit(str(exc)) from exc
+        print(df)
         return
 
     if args.table:
@@ -150,20 +427,122 @@ def main() -> None:
         print(f"Saved CSV: {csv_name}")
         return
 
+    if args.all_tables:
+        try:
+            result = controller.all_tables(
+                args.all_tables,
+                first_row_is_header=args.first_row_is_header,
+                output_path=args.output,
+                wait_seconds=args.wait or 0.0,
+            )
+        except Exception as exc:
+            raise SystemExit(str(exc)) from exc
+        print(result.value_counts)
+        print()
+        for source, error in result.failed:
+            print(f"Skipped {source}: {error}", file=sys.stderr)
+        print(f"Saved {result.tables} tables from {result.pages} pages: {result.output_path}")
+        return
+
     if args.auto_count_words:
         if args.depth is None:
             raise SystemExit("--depth is required with --auto-count-words")
         if args.wait is None:
             raise SystemExit("--wait is required with --auto-count-words")
+        language_filter = None
+        if args.filter_language:
+            from wiki_scraper.language_filter import LanguageFilter
+
+            try:
+                language_filter = LanguageFilter(
+                    args.filter_language,
+                    threshold=args.language_threshold,
+                )
+            except Exception as exc:
+                raise SystemExit(str(exc)) from exc
+        corpus = None
+        if args.corpus:
+            from wiki_scraper.corpus import CorpusWriter
+
+            try:
+                corpus = CorpusWriter(args.corpus, max_ngram=args.ngrams)
+            except Exception as exc:
+                raise SystemExit(str(exc)) from exc
+        index = None
+        if args.index:
+            from wiki_scraper.search_index import IndexBuilder
+
+            try:
+                index = IndexBuilder(args.index)
+            except Exception as exc:
+                raise SystemExit(str(exc)) from exc
+        link_graph = None
+        if args.link_graph:
+            from wiki_scraper.link_graph import LinkGraphBuilder
+
+            try:
+                link_graph = LinkGraphBuilder(args.link_graph, graph_format=args.link_graph_format)
+            except Exception as exc:
+                raise SystemExit(str(exc)) from exc
         try:
-            processed = controller.auto_count_words(
+            result = controller.auto_count_words(
                 args.auto_count_words,
                 depth=args.depth,
                 wait_seconds=args.wait,
+                language_filter=language_filter,
+                corpus=corpus,
+                index=index,
+                max_pages=args.max_pages,
+                max_bytes=args.max_bytes,
+                deadline_seconds=args.deadline,
+                resume=args.resume,
+                link_graph=link_graph,
+                crawl_order=args.crawl_order,
             )
         except Exception as exc:
             raise SystemExit(str(exc)) from exc
-        print(f"Processed {processed} pages and updated word-counts.json")
+        finally:
+            if corpus is not None:
+                corpus.close()
+            if index is not None:
+                index.close()
+            if link_graph is not None:
+                link_graph.close()
+        print(
+            f"Processed {result.pages} pages ({result.failed} failed, "
+            f"{result.bytes_fetched / 1_000_000:.1f} MB) and updated "
+            f"{args.sketch or 'word-counts.json'}"
+        )
+        if not result.complete:
+            print(
+                f"Stopped ({result.stop_reason}) with {result.queued} pages queued; "
+                f"frontier saved to {result.frontier_path}. Resume with: "
+                f"{_resume_command()}"
+            )
+        if language_filter is not None:
+            print(language_filter.summary())
+        if corpus is not None:
+            print(f"Stored {corpus.pages_written} pages in corpus {args.corpus}")
+        if index is not None:
+            print(f"Indexed {index.pages_added} pages in {args.index}")
+        if link_graph is not None:
+            print(
+                f"Recorded links of {link_graph.pages_added} pages "
+                f"({link_graph.node_count} nodes) in {args.link_graph}"
+            )
+        return
+
+    if args.refresh_word_counts:
+        if args.wait is None:
+            raise SystemExit("--wait is required with --refresh-word-counts")
+        try:
+            result = controller.refresh_word_counts(wait_seconds=args.wait)
+        except Exception as exc:
+            raise SystemExit(str(exc)) from exc
+        print(
+            f"Checked {result.checked} pages: {result.updated} updated, "
+            f"{result.unchanged} unchanged, {result.failed} failed"
+        )
         return
 
     if args.analyze_relative_word_frequency:
@@ -177,13 +556,15 @@ def main() -> None:
                 count=args.count,
                 language_code=args.language,
                 chart_path=args.chart,
+                chart_style=args.chart_style,
             )
         except Exception as exc:
             raise SystemExit(str(exc)) from exc
         print(df)
         if args.chart:
             print()
-            print(f"Saved chart: {args.chart}")
+            for path in df.attrs.get("chart_paths", [args.chart]):
+                print(f"Saved chart: {path}")
         return
 
     raise SystemExit("No valid command provided")
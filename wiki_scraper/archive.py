@@ -0,0 +1,91 @@
+"""Append-only compressed archive of fetched pages for network-free replay.
+
+Each page is stored as a WARC/1.1 ``resource`` record in its own gzip member,
+so the archive is a valid ``.warc.gz`` file and any record can be decompressed
+on its own. A JSON-lines sidecar (``<archive>.idx``) maps URLs to the byte
+offset and length of their member.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+class PageArchiveWriter:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        if self.path.parent and str(self.path.parent) not in {".", ""}:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records_written = 0
+
+    def write(self, url: str, html: str) -> None:
+        body = html.encode("utf-8")
+        headers = (
+            "WARC/1.1\r\n"
+            "WARC-Type: resource\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            "Content-Type: text/html; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        ).encode("utf-8")
+        member = gzip.compress(headers + body + b"\r\n\r\n")
+
+        with self.path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(member)
+        with _index_path(self.path).open("a", encoding="utf-8") as fh:
+            fh.write(
+                json.dumps({"url": url, "offset": offset, "length": len(member)}, ensure_ascii=True)
+                + "\n"
+            )
+        self.records_written += 1
+
+
+class PageArchiveReader:
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        index_path = _index_path(self.path)
+        if not self.path.exists() or not index_path.exists():
+            raise FileNotFoundError(f"Page archive not found: {self.path}")
+        self._offsets: dict[str, tuple[int, int]] = {}
+        for line in index_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            # Later records for the same URL replace earlier ones.
+            self._offsets[entry["url"]] = (int(entry["offset"]), int(entry["length"]))
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def read(self, url: str) -> str | None:
+        location = self._offsets.get(url)
+        if location is None:
+            return None
+        offset, length = location
+        with self.path.open("rb") as fh:
+            fh.seek(offset)
+            record = gzip.decompress(fh.read(length))
+
+        head, _, rest = record.partition(b"\r\n\r\n")
+        content_length = None
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                content_length = int(value.strip())
+        if content_length is None:
+            raise ValueError(f"Corrupt archive record for {url}")
+        return rest[:content_length].decode("utf-8")
@@ -2,6 +2,7 @@
 
 DEFAULT_BASE_URL = "https://bulbapedia.bulbagarden.net"
 ARTICLE_PATH_PREFIX = "/wiki/"
+API_PATH = "/w/api.php"
 
 DEFAULT_HEADERS = {
     "User-Agent": "WikiScraper/1.0 (+https://example.local)"
@@ -4,53 +4,96 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from time import sleep
-from typing import TYPE_CHECKING
+from pathlib import Path
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Optional, Sequence
 import sys
 
-from wiki_scraper import parser
+from wiki_scraper import metrics
+from wiki_scraper.archive import PageArchiveReader, PageArchiveWriter
 from wiki_scraper.config import ARTICLE_PATH_PREFIX, DEFAULT_BASE_URL
-from wiki_scraper.scraper import Scraper
+from wiki_scraper.crawl import (
+    DEFAULT_FRONTIER_PATH,
+    CrawlFrontier,
+    CrawlResult,
+    GracefulStop,
+    check_resume,
+    load_frontier,
+    save_frontier,
+)
+from wiki_scraper.extraction_cache import ExtractionCache, PageExtraction
+from wiki_scraper.revisions import (
+    DEFAULT_PAGE_STATES_PATH,
+    PageState,
+    PageStateLog,
+    RefreshResult,
+    fetch_revision_ids,
+)
+from wiki_scraper.scraper import PageNotModified, Scraper
 from wiki_scraper.utils import (
     href_to_phrase,
-    is_wiki_article_href,
+    normalize_phrase_for_visit,
     phrase_to_csv_filename,
 )
 from wiki_scraper.words import (
+    TopKSketch,
     count_words,
+    load_sketch,
     load_word_counts,
     merge_word_counts,
+    save_sketch,
     save_word_counts,
+    subtract_word_counts,
     tokenize_words,
 )
 
 if TYPE_CHECKING:
     import pandas as pd
 
+    from wiki_scraper.corpus import CorpusWriter
+    from wiki_scraper.language_filter import LanguageFilter
+    from wiki_scraper.link_graph import LinkGraphBuilder, RankedFrontier
+    from wiki_scraper.search_index import IndexBuilder, SearchHit
+    from wiki_scraper.tables import BatchTablesResult
+
+CRAWL_ORDERS = ("bfs", "in-degree", "pagerank")
+
 
 @dataclass(frozen=True)
 class ControllerConfig:
     base_url: str = DEFAULT_BASE_URL
     use_local_html_file: bool = False
     local_html_path: str | None = None
+    sketch_path: str | None = None
+    sketch_top_k: int = 1000
+    sketch_epsilon: float = 0.001
+    sketch_delta: float = 0.01
+    archive_path: str | None = None
+    replay_archive_path: str | None = None
+    extraction_cache_dir: str | None = None
+    track_revisions: bool = False
+    progress_interval_seconds: float = 0.0
+    request_deadline_seconds: float | None = None
 
 
 class WikiController:
     def __init__(self, config: ControllerConfig) -> None:
+        if config.request_deadline_seconds is not None and config.request_deadline_seconds <= 0:
+            raise ValueError("request-deadline must be > 0")
         self.config = config
         self._word_counts_path = "word-counts.json"
+        self._page_states_path = DEFAULT_PAGE_STATES_PATH
+        self._frontier_path = DEFAULT_FRONTIER_PATH
+        self._archive: Optional[PageArchiveWriter] = None
+        self._replay_archive: Optional[PageArchiveReader] = None
+        if config.archive_path:
+            self._archive = PageArchiveWriter(config.archive_path)
+        if config.replay_archive_path:
+            self._replay_archive = PageArchiveReader(config.replay_archive_path)
+        self._extraction_cache = ExtractionCache(directory=config.extraction_cache_dir)
 
     def summary(self, phrase: str) -> str:
-        scraper = Scraper(
-            self.config.base_url,
-            phrase,
-            use_local_html_file_instead=self.config.use_local_html_file,
-            local_html_path=self.config.local_html_path,
-        )
-        html = scraper.fetch_html()
-        soup = parser.parse_html(html)
-        root = parser.find_article_root(soup)
-        text = parser.extract_first_paragraph_text(root)
+        text = self._extract_page(phrase).first_paragraph
         if not text:
             raise ValueError("No paragraph text found in article")
         return text
@@ -71,105 +114,364 @@ class WikiController:
 
         from wiki_scraper.tables import extract_table_result, get_nth_table
 
-        scraper = Scraper(
-            self.config.base_url,
-            phrase,
-            use_local_html_file_instead=self.config.use_local_html_file,
-            local_html_path=self.config.local_html_path,
-        )
-        html = scraper.fetch_html()
-        soup = parser.parse_html(html)
-        root = parser.find_article_root(soup)
-
-        tables = parser.extract_tables(root)
-        table_tag = get_nth_table(tables, number)
-        result = extract_table_result(table_tag, first_row_is_header=first_row_is_header)
+        tables = self._extract_page(phrase, tables=True).tables or []
+        table_rows = get_nth_table(tables, number)
+        result = extract_table_result(table_rows, first_row_is_header=first_row_is_header)
 
         csv_name = phrase_to_csv_filename(phrase)
         result.dataframe.to_csv(csv_name, index=True, encoding="utf-8")
         return result.dataframe, result.value_counts, csv_name
 
-    def count_words(self, phrase: str, *, json_path: str = "word-counts.json") -> int:
-        scraper = Scraper(
-            self.config.base_url,
-            phrase,
-            use_local_html_file_instead=self.config.use_local_html_file,
-            local_html_path=self.config.local_html_path,
+    def all_tables(
+        self,
+        phrases: list[str],
+        *,
+        first_row_is_header: bool,
+        output_path: str,
+        wait_seconds: float = 0.0,
+    ) -> "BatchTablesResult":
+        try:
+            import pandas as pd  # unused, only for dependency check
+        except Exception as exc:
+            raise RuntimeError(
+                "pandas is required for --all-tables. Install dependencies from requirements.txt"
+            ) from exc
+
+        from wiki_scraper.tables import (
+            BatchTablesResult,
+            TableBatchWriter,
+            merge_value_counts,
+            table_rows_to_dataframe,
+            table_to_long_frame,
         )
-        html = scraper.fetch_html()
-        soup = parser.parse_html(html)
-        root = parser.find_article_root(soup)
-        text = parser.extract_all_text(root)
 
+        if wait_seconds < 0:
+            raise ValueError("wait must be >= 0")
+
+        writer = TableBatchWriter(output_path)
+        result = BatchTablesResult(output_path=output_path)
+        page_counts = []
+        try:
+            for i, phrase in enumerate(phrases):
+                if i and wait_seconds:
+                    sleep(wait_seconds)
+                try:
+                    extraction = self._extract_page(phrase, tables=True)
+                except Exception as exc:
+                    print(str(exc), file=sys.stderr)
+                    result.failed.append((phrase, str(exc)))
+                    continue
+
+                frames = []
+                for number, table_rows in enumerate(extraction.tables or [], start=1):
+                    try:
+                        df = table_rows_to_dataframe(
+                            table_rows, first_row_is_header=first_row_is_header
+                        )
+                    except Exception as exc:
+                        result.failed.append((f"{phrase} #{number}", str(exc)))
+                        continue
+                    frames.append(table_to_long_frame(df, page=phrase, table_number=number))
+
+                result.pages += 1
+                result.tables += len(frames)
+                if frames:
+                    long = pd.concat(frames, ignore_index=True)
+                    writer.write(long)
+                    page_counts.append(long["value"].value_counts())
+        finally:
+            writer.close()
+
+        result.value_counts = merge_value_counts(page_counts)
+        return result
+
+    def count_words(self, phrase: str, *, json_path: str = "word-counts.json") -> int:
+        text = self._extract_page(phrase).text
         return self._update_word_counts(text, json_path=json_path)
 
-    def auto_count_words(self, start_phrase: str, *, depth: int, wait_seconds: float) -> int:
+    def auto_count_words(
+        self,
+        start_phrase: str,
+        *,
+        depth: int,
+        wait_seconds: float,
+        language_filter: Optional["LanguageFilter"] = None,
+        corpus: Optional["CorpusWriter"] = None,
+        index: Optional["IndexBuilder"] = None,
+        max_pages: int | None = None,
+        max_bytes: int | None = None,
+        deadline_seconds: float | None = None,
+        resume: bool = False,
+        link_graph: Optional["LinkGraphBuilder"] = None,
+        crawl_order: str = "bfs",
+    ) -> CrawlResult:
         if depth < 0:
             raise ValueError("depth must be >= 0")
         if wait_seconds < 0:
             raise ValueError("wait must be >= 0")
+        for name, value in (
+            ("max-pages", max_pages),
+            ("max-bytes", max_bytes),
+            ("deadline", deadline_seconds),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0")
+        if crawl_order not in CRAWL_ORDERS:
+            raise ValueError(f"crawl order must be one of: {', '.join(CRAWL_ORDERS)}")
         if self.config.use_local_html_file and depth > 0:
             raise ValueError("--auto-count-words with --use-local-html supports only --depth 0")
+        if self.config.track_revisions and self.config.sketch_path:
+            raise ValueError("--track-revisions cannot be combined with --sketch")
+        options: dict[str, object] = {
+            "sketch": self.config.sketch_path,
+            "track-revisions": self.config.track_revisions,
+            "filter-language": language_filter.language_code if language_filter else None,
+            "language-threshold": language_filter.threshold if language_filter else None,
+            "corpus": str(corpus.directory) if corpus is not None else None,
+            "index": str(index.directory) if index is not None else None,
+            "link-graph": link_graph.directory if link_graph is not None else None,
+            "crawl-order": crawl_order,
+        }
+        if crawl_order != "bfs" and link_graph is None:
+            from wiki_scraper.link_graph import LinkGraphBuilder
+
+            link_graph = LinkGraphBuilder(None)
 
         visited: set[str] = set()
         seen: set[str] = set()
-        queue: deque[tuple[str, int]] = deque()
-        queue.append((start_phrase, 0))
-        seen.add(normalize_phrase_for_visit(start_phrase))
+        queue: deque[tuple[str, int]] | RankedFrontier = deque()
+        if link_graph is not None and crawl_order != "bfs":
+            queue = link_graph.frontier(by=crawl_order)
+        if resume:
+            frontier = load_frontier(self._frontier_path)
+            if frontier is None:
+                raise ValueError(f"No saved crawl frontier in {self._frontier_path}")
+            check_resume(frontier, start_phrase, depth, options)
+            queue.extend(frontier.queue)
+            visited.update(frontier.visited)
+            seen.update(visited)
+            seen.update(normalize_phrase_for_visit(phrase) for phrase, _ in queue)
+        else:
+            queue.append((start_phrase, 0))
+            seen.add(normalize_phrase_for_visit(start_phrase))
+
+        sketch = self._load_or_create_sketch()
+        existing = load_word_counts(self._word_counts_path) if sketch is None else {}
+        page_states = (
+            PageStateLog(self._page_states_path) if self.config.track_revisions else None
+        )
+        progress = metrics.ProgressReporter(self.config.progress_interval_seconds)
+        result = CrawlResult()
+        started = monotonic()
+        deadline_at = started + deadline_seconds if deadline_seconds is not None else None
+
+        # A page that was popped but not fully counted goes back to the queue if the
+        # crawl stops (budget, signal or error) before it is saved.
+        in_flight: tuple[str, int] | None = None
+        finished = False
+        try:
+            with GracefulStop() as stop:
+                while queue:
+                    remaining = None
+                    if deadline_seconds is not None:
+                        remaining = deadline_seconds - (monotonic() - started)
+                    if stop.requested:
+                        result.stop_reason = stop.requested
+                    elif max_pages is not None and result.pages >= max_pages:
+                        result.stop_reason = "max-pages"
+                    elif max_bytes is not None and result.bytes_fetched >= max_bytes:
+                        result.stop_reason = "max-bytes"
+                    elif remaining is not None and remaining <= 0:
+                        result.stop_reason = "deadline"
+                    if result.stop_reason:
+                        break
+
+                    progress.update(pages=result.pages, queued=len(queue))
+                    phrase, dist = queue.popleft()
+                    key = normalize_phrase_for_visit(phrase)
+                    if key in visited:
+                        continue
+                    visited.add(key)
+                    in_flight = (phrase, dist)
+
+                    request_deadline = self.config.request_deadline_seconds
+                    if remaining is not None:
+                        request_deadline = min(request_deadline or remaining, remaining)
+
+                    print(phrase)
+                    try:
+                        extraction, scraper = self._fetch_page(
+                            phrase, deadline_seconds=request_deadline
+                        )
+                    except Exception as exc:
+                        out_of_time = (
+                            deadline_seconds is not None
+                            and monotonic() - started >= deadline_seconds
+                        )
+                        cut_short = stop.requested or ("deadline" if out_of_time else None)
+                        if cut_short:
+                            # The crawl, not the page, ran out of time: leave it for --resume.
+                            print(f"Interrupted: {phrase} ({exc})", file=sys.stderr)
+                            result.stop_reason = cut_short
+                            break
+                        in_flight = None
+                        print(str(exc), file=sys.stderr)
+                        result.failed += 1
+                        metrics.incr("crawl.failed")
+                        stop.wait(wait_seconds, deadline=deadline_at)
+                        continue
+                    result.bytes_fetched += scraper.bytes_fetched
+
+                    words = tokenize_words(extraction.text)
+                    counts = count_words(words)
+                    if language_filter is not None and not language_filter.accepts(phrase, counts):
+                        in_flight = None
+                        print(f"Skipped (language): {phrase}", file=sys.stderr)
+                        result.skipped += 1
+                        metrics.incr("crawl.skipped")
+                        stop.wait(wait_seconds, deadline=deadline_at)
+                        continue
+
+                    result.pages += 1
+                    metrics.incr("crawl.pages")
+
+                    linked = [
+                        href_to_phrase(href, prefix=ARTICLE_PATH_PREFIX)
+                        for href in extraction.links
+                    ]
+                    if link_graph is not None:
+                        link_graph.add_page(phrase, linked)
+                    if dist < depth:
+                        for next_phrase in linked:
+                            next_key = normalize_phrase_for_visit(next_phrase)
+                            if next_key in seen:
+                                continue
+                            queue.append((next_phrase, dist + 1))
+                            seen.add(next_key)
+
+                    if corpus is not None:
+                        corpus.add_page(phrase, words)
+                    if index is not None:
+                        index.add_page(phrase, counts)
+                    if sketch is not None:
+                        sketch.update_counts(counts)
+                        save_sketch(sketch, self.config.sketch_path)
+                    elif page_states is not None:
+                        previous = page_states.get(key)
+                        if previous is not None:
+                            # Re-crawled page: replace its earlier contribution, don't add twice.
+                            existing = subtract_word_counts(existing, previous.counts)
+                        existing = merge_word_counts(existing, counts)
+                        save_word_counts(existing, self._word_counts_path)
+                        page_states.put(
+                            key,
+                            PageState(phrase, extraction.revision_id, scraper.etag, dict(counts)),
+                        )
+                    else:
+                        existing = merge_word_counts(existing, counts)
+                        save_word_counts(existing, self._word_counts_path)
+                    in_flight = None
+
+                    if queue:
+                        stop.wait(wait_seconds, deadline=deadline_at)
+
+            finished = True
+        finally:
+            if in_flight is not None:
+                visited.discard(normalize_phrase_for_visit(in_flight[0]))
+                queue.appendleft(in_flight)
+            if page_states is not None:
+                page_states.compact()
+            result.queued = len(queue)
+            if result.stop_reason or (not finished and queue):
+                save_frontier(
+                    CrawlFrontier(start_phrase, depth, list(queue), sorted(visited), options),
+                    self._frontier_path,
+                )
+                result.frontier_path = self._frontier_path
+            elif resume:
+                Path(self._frontier_path).unlink(missing_ok=True)
+        return result
+
+    def refresh_word_counts(self, *, wait_seconds: float) -> RefreshResult:
+        if wait_seconds < 0:
+            raise ValueError("wait must be >= 0")
+        if self.config.sketch_path:
+            raise ValueError("--refresh-word-counts cannot be combined with --sketch")
+        if self.config.use_local_html_file:
+            raise ValueError("--refresh-word-counts is not supported with --use-local-html")
+
+        store = PageStateLog(self._page_states_path)
+        states = store.states
+        if not states:
+            raise ValueError(
+                f"No tracked pages in {self._page_states_path}. "
+                "Run --auto-count-words with --track-revisions first."
+            )
+
+        current: dict[str, int] = {}
+        if self._replay_archive is None:
+            try:
+                current = fetch_revision_ids(
+                    self.config.base_url, [state.phrase for state in states.values()]
+                )
+            except Exception as exc:
+                print(
+                    f"Revision lookup failed, using conditional requests: {exc}",
+                    file=sys.stderr,
+                )
 
         existing = load_word_counts(self._word_counts_path)
-        processed = 0
-        while queue:
-            phrase, dist = queue.popleft()
-            key = normalize_phrase_for_visit(phrase)
-            if key in visited:
+        result = RefreshResult()
+        for key, state in list(states.items()):
+            result.checked += 1
+            revision_id = current.get(state.phrase)
+            if revision_id is not None and revision_id == state.revision_id:
+                result.unchanged += 1
                 continue
-            visited.add(key)
 
-            print(phrase)
+            print(state.phrase)
             try:
-                scraper = Scraper(
-                    self.config.base_url,
-                    phrase,
-                    use_local_html_file_instead=self.config.use_local_html_file,
-                    local_html_path=self.config.local_html_path,
+                extraction, scraper = self._fetch_page(
+                    state.phrase,
+                    if_none_match=state.etag if revision_id is None else None,
                 )
-                html = scraper.fetch_html()
-                soup = parser.parse_html(html)
-                root = parser.find_article_root(soup)
+            except PageNotModified:
+                result.unchanged += 1
+                sleep(wait_seconds)
+                continue
             except Exception as exc:
                 print(str(exc), file=sys.stderr)
+                result.failed += 1
                 sleep(wait_seconds)
                 continue
 
-            processed += 1
-
-            if dist < depth:
-                for href in parser.extract_links(root):
-                    if not is_wiki_article_href(href, prefix=ARTICLE_PATH_PREFIX):
-                        continue
-                    next_phrase = href_to_phrase(href, prefix=ARTICLE_PATH_PREFIX)
-                    next_key = normalize_phrase_for_visit(next_phrase)
-                    if next_key in seen:
-                        continue
-                    queue.append((next_phrase, dist + 1))
-                    seen.add(next_key)
+            if extraction.revision_id is not None and extraction.revision_id == state.revision_id:
+                result.unchanged += 1
+                sleep(wait_seconds)
+                continue
 
-            text = parser.extract_all_text(root)
-            existing, _ = self._update_word_counts_with_existing(existing, text)
+            counts = count_words(tokenize_words(extraction.text))
+            existing = subtract_word_counts(existing, state.counts)
+            existing = merge_word_counts(existing, counts)
             save_word_counts(existing, self._word_counts_path)
+            updated = PageState(state.phrase, extraction.revision_id, scraper.etag, dict(counts))
+            store.put(key, updated)
+            result.updated += 1
 
             sleep(wait_seconds)
 
-        return processed
+        store.compact()
+        return result
 
     def analyze_relative_word_frequency(
         self,
         *,
         mode: str,
         count: int,
-        language_code: str,
+        language_code: str | Sequence[str],
         chart_path: str | None,
+        chart_style: str = "auto",
         word_counts_path: str = "word-counts.json",
     ) -> "pd.DataFrame":
         try:
@@ -182,39 +484,111 @@ class WikiController:
 
         from wiki_scraper.relative_frequency import analyze_relative_word_frequency
 
-        word_counts = load_word_counts(word_counts_path)
-        if not word_counts:
-            raise ValueError(
-                f"No word counts found in {word_counts_path}. Run --count-words first."
-            )
+        if self.config.sketch_path:
+            sketch = load_sketch(self.config.sketch_path)
+            if sketch is None or not sketch.total:
+                raise ValueError(
+                    f"No word counts found in {self.config.sketch_path}. "
+                    "Run --count-words with --sketch first."
+                )
+            if mode == "article" and count > sketch.capacity:
+                raise ValueError(
+                    f"--count {count} exceeds the sketch top-k capacity ({sketch.capacity})"
+                )
+            word_counts = dict(sketch.top())
+        else:
+            word_counts = load_word_counts(word_counts_path)
+            if not word_counts:
+                raise ValueError(
+                    f"No word counts found in {word_counts_path}. Run --count-words first."
+                )
         return analyze_relative_word_frequency(
             word_counts,
             language_code=language_code,
             mode=mode,
             count=count,
             chart_path=chart_path,
+            chart_style=chart_style,
         )
 
+    def search(self, query: str, *, index_dir: str, count: int = 10) -> list["SearchHit"]:
+        from wiki_scraper.search_index import InvertedIndex
+
+        with InvertedIndex(index_dir) as index:
+            return index.search(query, count=count)
+
+    def rank_pages(
+        self, *, graph_dir: str, count: int = 10, by: str = "pagerank"
+    ) -> "pd.DataFrame":
+        from wiki_scraper.link_graph import load_link_graph
+
+        graph = load_link_graph(graph_dir)
+        if graph is None:
+            raise FileNotFoundError(f"Link graph not found: {graph_dir}")
+        return graph.top(count, by=by)
+
+    def _make_scraper(
+        self,
+        phrase: str,
+        *,
+        if_none_match: str | None = None,
+        deadline_seconds: float | None = None,
+    ) -> Scraper:
+        return Scraper(
+            self.config.base_url,
+            phrase,
+            use_local_html_file_instead=self.config.use_local_html_file,
+            local_html_path=self.config.local_html_path,
+            archive=self._archive,
+            replay_archive=self._replay_archive,
+            if_none_match=if_none_match,
+            deadline_seconds=(
+                self.config.request_deadline_seconds
+                if deadline_seconds is None
+                else deadline_seconds
+            ),
+        )
+
+    def _fetch_page(
+        self,
+        phrase: str,
+        *,
+        if_none_match: str | None = None,
+        deadline_seconds: float | None = None,
+        tables: bool = False,
+    ) -> tuple[PageExtraction, Scraper]:
+        scraper = self._make_scraper(
+            phrase, if_none_match=if_none_match, deadline_seconds=deadline_seconds
+        )
+        html = scraper.fetch_html()
+        return self._extraction_cache.get_or_extract(html, tables=tables), scraper
+
+    def _extract_page(self, phrase: str, *, tables: bool = False) -> PageExtraction:
+        return self._fetch_page(phrase, tables=tables)[0]
+
     def _update_word_counts(self, text: str, *, json_path: str) -> int:
         words = tokenize_words(text)
         counts = count_words(words)
 
+        sketch = self._load_or_create_sketch()
+        if sketch is not None:
+            sketch.update_counts(counts)
+            save_sketch(sketch, self.config.sketch_path)
+            return sum(counts.values())
+
         existing = load_word_counts(json_path)
         merged = merge_word_counts(existing, counts)
         save_word_counts(merged, json_path)
         return sum(counts.values())
 
-    def _update_word_counts_with_existing(
-        self,
-        existing: dict[str, int],
-        text: str,
-    ) -> tuple[dict[str, int], int]:
-        words = tokenize_words(text)
-        counts = count_words(words)
-
-        merged = merge_word_counts(existing, counts)
-        return merged, sum(counts.values())
-
-
-def normalize_phrase_for_visit(phrase: str) -> str:
-    return " ".join(phrase.strip().lower().split())
+    def _load_or_create_sketch(self) -> Optional[TopKSketch]:
+        if not self.config.sketch_path:
+            return None
+        sketch = load_sketch(self.config.sketch_path)
+        if sketch is not None:
+            return sketch
+        return TopKSketch.create(
+            top_k=self.config.sketch_top_k,
+            epsilon=self.config.sketch_epsilon,
+            delta=self.config.sketch_delta,
+        )
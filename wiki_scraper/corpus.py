@@ -0,0 +1,234 @@
+"""Compact per-page term storage (unigrams and n-grams) for offline analysis.
+
+A corpus directory holds an integer-encoded vocabulary and flat arrays of
+``(doc_id, term_id, count)`` triples, appended page by page while crawling:
+
+- ``vocab.txt``: one term per line; the line number is the term id,
+- ``docs.jsonl``: one JSON object per page (doc id, phrase, token count),
+- ``postings.bin``: little-endian int32 triples ``doc_id, term_id, count``.
+
+N-grams are stored as their words joined by a single space.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+VOCAB_FILE = "vocab.txt"
+DOCS_FILE = "docs.jsonl"
+POSTINGS_FILE = "postings.bin"
+
+
+def ngrams(words: Sequence[str], n: int) -> list[str]:
+    if n <= 0:
+        raise ValueError("n-gram order must be > 0")
+    if n == 1:
+        return list(words)
+    return [" ".join(words[i : i + n]) for i in range(len(words) - n + 1)]
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _truncate_incomplete_postings(path: Path, complete_docs: int) -> None:
+    """Drop trailing triples of a page that was interrupted before its docs entry."""
+
+    record = 12
+    with path.open("r+b") as fh:
+        size = fh.seek(0, 2)
+        end = size - size % record
+        while end >= record:
+            fh.seek(end - record)
+            doc_id = int.from_bytes(fh.read(4), "little", signed=True)
+            if doc_id < complete_docs:
+                break
+            end -= record
+        if end != size:
+            fh.truncate(end)
+
+
+class CorpusWriter:
+    """Appends per-page term counts to a corpus directory."""
+
+    def __init__(self, directory: str, *, max_ngram: int = 1) -> None:
+        if max_ngram <= 0:
+            raise ValueError("max n-gram order must be > 0")
+        self.directory = Path(directory)
+        self.max_ngram = max_ngram
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._term_ids: dict[str, int] = {}
+        vocab_path = self.directory / VOCAB_FILE
+        if vocab_path.exists():
+            for line in vocab_path.read_text(encoding="utf-8").splitlines():
+                self._term_ids.setdefault(line, len(self._term_ids))
+
+        docs_path = self.directory / DOCS_FILE
+        self._next_doc_id = 0
+        if docs_path.exists():
+            with docs_path.open(encoding="utf-8") as fh:
+                self._next_doc_id = sum(1 for line in fh if line.strip())
+
+        postings_path = self.directory / POSTINGS_FILE
+        if postings_path.exists():
+            _truncate_incomplete_postings(postings_path, self._next_doc_id)
+
+        self._vocab = vocab_path.open("a", encoding="utf-8")
+        self._docs = docs_path.open("a", encoding="utf-8")
+        self._postings = postings_path.open("ab")
+        self.pages_written = 0
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._term_ids)
+            self._term_ids[term] = term_id
+            self._vocab.write(term + "\n")
+        return term_id
+
+    def add_page(self, phrase: str, words: Sequence[str]) -> int:
+        """Record unigram..max_ngram counts for one page and return its doc id."""
+
+        doc_id = self._next_doc_id
+        counts: Counter[str] = Counter()
+        for n in range(1, self.max_ngram + 1):
+            counts.update(ngrams(words, n))
+
+        triples = array("i")
+        for term, count in counts.items():
+            triples.extend((doc_id, self._term_id(term), count))
+
+        # Vocabulary and postings go first so a page listed in docs.jsonl is complete.
+        self._vocab.flush()
+        self._postings.write(_to_little_endian(triples))
+        self._postings.flush()
+        self._docs.write(
+            json.dumps({"doc_id": doc_id, "phrase": phrase, "tokens": len(words)}, ensure_ascii=True)
+            + "\n"
+        )
+        self._docs.flush()
+
+        self._next_doc_id += 1
+        self.pages_written += 1
+        return doc_id
+
+    def close(self) -> None:
+        for fh in (self._vocab, self._docs, self._postings):
+            fh.close()
+
+
+@dataclass(frozen=True)
+class Corpus:
+    vocabulary: list[str]
+    phrases: list[str]
+    doc_tokens: list[int]
+    doc_ids: array
+    term_ids: array
+    counts: array
+
+    def term_counts(self, n: int | None = 1) -> Counter[str]:
+        """Corpus-wide counts of n-grams of order ``n`` (all orders if ``None``)."""
+
+        totals: Counter[str] = Counter()
+        vocabulary = self.vocabulary
+        for term_id, count in zip(self.term_ids, self.counts):
+            term = vocabulary[term_id]
+            if n is None or term.count(" ") + 1 == n:
+                totals[term] += count
+        return totals
+
+    def page_counts(self, doc_id: int) -> dict[str, int]:
+        vocabulary = self.vocabulary
+        return {
+            vocabulary[t]: c
+            for d, t, c in zip(self.doc_ids, self.term_ids, self.counts)
+            if d == doc_id
+        }
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "doc_id": pd.Series(self.doc_ids, dtype="int32"),
+                "term_id": pd.Series(self.term_ids, dtype="int32"),
+                "count": pd.Series(self.counts, dtype="int32"),
+            }
+        )
+
+
+def load_corpus(directory: str) -> Corpus:
+    root = Path(directory)
+    docs_path = root / DOCS_FILE
+    if not docs_path.exists():
+        raise FileNotFoundError(f"Corpus not found: {root}")
+
+    phrases: list[str] = []
+    doc_tokens: list[int] = []
+    for line in docs_path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        doc = json.loads(line)
+        phrases.append(str(doc["phrase"]))
+        doc_tokens.append(int(doc.get("tokens", 0)))
+
+    vocabulary = (root / VOCAB_FILE).read_text(encoding="utf-8").splitlines()
+
+    data = (root / POSTINGS_FILE).read_bytes()
+    flat = array("i")
+    flat.frombytes(data[: len(data) - len(data) % 12])
+    if sys.byteorder != "little":
+        flat.byteswap()
+    doc_ids, term_ids, counts = flat[0::3], flat[1::3], flat[2::3]
+
+    # Drop postings of a page whose docs.jsonl entry was never written.
+    complete = len(phrases)
+    if doc_ids and doc_ids[-1] >= complete:
+        keep = next(i for i, d in enumerate(doc_ids) if d >= complete)
+        doc_ids, term_ids, counts = doc_ids[:keep], term_ids[:keep], counts[:keep]
+
+    return Corpus(
+        vocabulary=vocabulary,
+        phrases=phrases,
+        doc_tokens=doc_tokens,
+        doc_ids=doc_ids,
+        term_ids=term_ids,
+        counts=counts,
+    )
+
+
+def iter_pages(corpus: Corpus) -> Iterable[tuple[str, dict[str, int]]]:
+    """Yield ``(phrase, term_counts)`` for each stored page, in doc id order."""
+
+    vocabulary = corpus.vocabulary
+    current: dict[str, int] = {}
+    current_doc = 0
+    for d, t, c in zip(corpus.doc_ids, corpus.term_ids, corpus.counts):
+        while d != current_doc:
+            yield corpus.phrases[current_doc], current
+            current = {}
+            current_doc += 1
+        current[vocabulary[t]] = c
+    while current_doc < len(corpus.phrases):
+        yield corpus.phrases[current_doc], current
+        current = {}
+        current_doc += 1
@@ -0,0 +1,159 @@
+"""Crawl budgets, cancellation and the resumable crawl frontier.
+
+When ``auto_count_words`` stops before the frontier is exhausted (a page,
+byte or time budget ran out, or SIGINT/SIGTERM arrived) the remaining queue
+and the visited pages are written to ``crawl-frontier.json`` so that
+``--resume`` can continue the crawl without counting any page twice. The
+frontier also records the options that decide where counts go (sketch,
+revision tracking, corpus, index, link graph, language filter, crawl order)
+so a resume that would send them elsewhere is rejected.
+"""
+
+from __future__ import annotations
+
+import json
+import signal
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic
+from types import FrameType
+from typing import Optional
+
+from wiki_scraper.utils import normalize_phrase_for_visit, write_text_atomic
+
+DEFAULT_FRONTIER_PATH = "crawl-frontier.json"
+
+
+@dataclass
+class CrawlResult:
+    pages: int = 0
+    failed: int = 0
+    skipped: int = 0
+    bytes_fetched: int = 0
+    queued: int = 0
+    stop_reason: Optional[str] = None
+    frontier_path: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.stop_reason is None
+
+
+@dataclass
+class CrawlFrontier:
+    start_phrase: str
+    depth: int
+    queue: list[tuple[str, int]] = field(default_factory=list)
+    visited: list[str] = field(default_factory=list)
+    options: dict[str, object] = field(default_factory=dict)
+
+
+def _option_text(value: object) -> str:
+    return "unset" if value is None else str(value)
+
+
+def check_resume(
+    frontier: CrawlFrontier, start_phrase: str, depth: int, options: dict[str, object]
+) -> None:
+    """Reject a ``--resume`` whose phrase, depth or options differ from the stopped crawl."""
+
+    mismatches = []
+    same_start = normalize_phrase_for_visit(start_phrase) == normalize_phrase_for_visit(
+        frontier.start_phrase
+    )
+    if not same_start:
+        mismatches.append(f'phrase "{frontier.start_phrase}" (now "{start_phrase}")')
+    if depth != frontier.depth:
+        mismatches.append(f"--depth {frontier.depth} (now {depth})")
+    # Frontiers saved before options were recorded only carry the phrase and depth.
+    for name, value in frontier.options.items():
+        if options.get(name) != value:
+            now = options.get(name)
+            mismatches.append(f"--{name} {_option_text(value)} (now {_option_text(now)})")
+    if mismatches:
+        raise ValueError(
+            "--resume must repeat the stopped crawl's options: " + ", ".join(mismatches)
+        )
+
+
+def load_frontier(path: str = DEFAULT_FRONTIER_PATH) -> Optional[CrawlFrontier]:
+    p = Path(path)
+    if not p.exists():
+        return None
+    data = json.loads(p.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or not isinstance(data.get("start_phrase"), str):
+        raise ValueError(f"{path} is not a crawl frontier file")
+    return CrawlFrontier(
+        start_phrase=data["start_phrase"],
+        depth=int(data.get("depth", 0)),
+        queue=[(str(phrase), int(dist)) for phrase, dist in data.get("queue", [])],
+        visited=[str(key) for key in data.get("visited", [])],
+        options=dict(data.get("options") or {}),
+    )
+
+
+def save_frontier(frontier: CrawlFrontier, path: str = DEFAULT_FRONTIER_PATH) -> None:
+    data = {
+        "start_phrase": frontier.start_phrase,
+        "depth": frontier.depth,
+        "queue": [list(item) for item in frontier.queue],
+        "visited": frontier.visited,
+        "options": frontier.options,
+    }
+    write_text_atomic(path, json.dumps(data, ensure_ascii=True) + "\n")
+
+
+class GracefulStop:
+    """Turns the first SIGINT/SIGTERM into a stop request.
+
+    The crawl loop polls ``requested`` between pages, so the page in flight
+    is finished and saved before the crawl stops; ``wait`` replaces the
+    politeness sleep and returns as soon as a stop is requested. A second
+    signal restores the default behaviour and interrupts immediately.
+    Handlers are only installed from the main thread; elsewhere this is a
+    no-op.
+    """
+
+    SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+    def __init__(self) -> None:
+        self.requested: Optional[str] = None
+        self._event = threading.Event()
+        self._previous: dict[int, object] = {}
+
+    def __enter__(self) -> "GracefulStop":
+        if threading.current_thread() is threading.main_thread():
+            for signum in self.SIGNALS:
+                self._previous[signum] = signal.signal(signum, self._handle)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)  # type: ignore[arg-type]
+        self._previous.clear()
+
+    def wait(self, seconds: float, *, deadline: Optional[float] = None) -> bool:
+        """Sleep up to ``seconds``, but not past ``deadline`` (a ``monotonic()`` time).
+
+        Returns early, with True, once a stop has been requested.
+        """
+
+        if deadline is not None:
+            seconds = min(seconds, deadline - monotonic())
+        if seconds > 0 and self.requested is None:
+            self._event.wait(seconds)
+        return self.requested is not None
+
+    def _handle(self, signum: int, frame: Optional[FrameType]) -> None:
+        if self.requested is not None:
+            self.__exit__()
+            raise KeyboardInterrupt
+        self.requested = signal.Signals(signum).name
+        self._event.set()
+        print(
+            f"{self.requested} received, stopping after the current page "
+            "(send again to abort)",
+            file=sys.stderr,
+        )
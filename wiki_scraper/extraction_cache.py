@@ -0,0 +1,156 @@
+"""Cache of per-page extraction results, keyed by a hash of the page HTML.
+
+Parsing is the expensive step of every command, so the fields the commands
+need are extracted once per page and reused: from an in-memory LRU within a
+run, and optionally from a directory of zlib-compressed records across runs.
+Table rows are only extracted for callers that ask for them (``--table``,
+``--all-tables``); text-only commands skip that work.
+Bump ``EXTRACTOR_VERSION`` whenever extraction logic changes so stale records
+are never served.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from wiki_scraper import metrics, parser
+from wiki_scraper.config import ARTICLE_PATH_PREFIX
+from wiki_scraper.utils import is_wiki_article_href
+
+EXTRACTOR_VERSION = 2
+
+
+@dataclass(frozen=True)
+class PageExtraction:
+    text: str
+    first_paragraph: str
+    links: list[str]
+    tables: list[parser.TableRows] | None = None
+    revision_id: int | None = None
+
+
+def extract_page(html: str, *, tables: bool = False) -> PageExtraction:
+    root = parser.find_article_root(parser.parse_html(html))
+    return PageExtraction(
+        revision_id=parser.extract_revision_id(html),
+        text=parser.extract_all_text(root),
+        first_paragraph=parser.extract_first_paragraph_text(root),
+        links=[
+            href
+            for href in parser.extract_links(root)
+            if is_wiki_article_href(href, prefix=ARTICLE_PATH_PREFIX)
+        ],
+        tables=(
+            [parser.extract_table_rows(table) for table in parser.extract_tables(root)]
+            if tables
+            else None
+        ),
+    )
+
+
+def page_key(html: str) -> str:
+    digest = hashlib.sha256(f"v{EXTRACTOR_VERSION}\n".encode("ascii"))
+    digest.update(html.encode("utf-8", errors="surrogatepass"))
+    return digest.hexdigest()
+
+
+def _encode(extraction: PageExtraction) -> bytes:
+    payload = {
+        "version": EXTRACTOR_VERSION,
+        "text": extraction.text,
+        "first_paragraph": extraction.first_paragraph,
+        "links": extraction.links,
+        "tables": None if extraction.tables is None else [list(rows) for rows in extraction.tables],
+        "revision_id": extraction.revision_id,
+    }
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(data: bytes) -> PageExtraction | None:
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    if payload.get("version") != EXTRACTOR_VERSION:
+        return None
+    return PageExtraction(
+        text=payload["text"],
+        first_paragraph=payload["first_paragraph"],
+        links=payload["links"],
+        tables=(
+            None
+            if payload["tables"] is None
+            else [(head, body, foot) for head, body, foot in payload["tables"]]
+        ),
+        revision_id=payload.get("revision_id"),
+    )
+
+
+class ExtractionCache:
+    def __init__(self, *, max_entries: int = 32, directory: str | None = None) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, PageExtraction] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_extract(self, html: str, *, tables: bool = False) -> PageExtraction:
+        """Return the page's extraction; ``tables=True`` also needs its table rows.
+
+        An entry cached without tables counts as a miss for a caller that
+        needs them and is replaced by a full extraction.
+        """
+
+        key = page_key(html)
+        extraction = self._entries.get(key)
+        if extraction is not None and (not tables or extraction.tables is not None):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.incr("extraction_cache.hits")
+            return extraction
+
+        extraction = self._read_disk(key)
+        if extraction is not None and tables and extraction.tables is None:
+            extraction = None
+        if extraction is not None:
+            self.hits += 1
+            metrics.incr("extraction_cache.hits")
+        else:
+            self.misses += 1
+            metrics.incr("extraction_cache.misses")
+            extraction = extract_page(html, tables=tables)
+            self._write_disk(key, extraction)
+
+        self._entries[key] = extraction
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return extraction
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.bin"
+
+    def _read_disk(self, key: str) -> PageExtraction | None:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return _decode(path.read_bytes())
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+
+    def _write_disk(self, key: str, extraction: PageExtraction) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(_encode(extraction))
+        tmp.replace(path)
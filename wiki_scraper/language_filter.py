@@ -0,0 +1,81 @@
+"""Per-page language detection used to filter crawled pages."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Container, Mapping
+
+from wiki_scraper.words import load_language_words
+
+
+@dataclass
+class LanguageFilterStats:
+    checked: int = 0
+    skipped: int = 0
+    skipped_phrases: list[str] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> int:
+        return self.checked - self.skipped
+
+
+# One-letter tokens ("a", "i", "o", "w") are top words in many languages at
+# once, so they say nothing about which language a page is written in.
+MIN_WORD_LENGTH = 2
+
+DEFAULT_THRESHOLD = 0.35
+
+
+def lang_confidence_score(word_counts: Mapping[str, int], language_words: Container[str]) -> float:
+    """Share of the page's words (two letters or longer) found in the language's top-k list."""
+
+    total = 0
+    shared = 0
+    for word, count in word_counts.items():
+        if count <= 0 or len(word) < MIN_WORD_LENGTH:
+            continue
+        total += count
+        if word in language_words:
+            shared += count
+    return shared / total if total else 0.0
+
+
+class LanguageFilter:
+    """Scores page word counts against a wordfreq top-k list and tracks skips.
+
+    With the top 1000 words, English pages down to one-sentence stubs score
+    above 0.5, while Polish, German, French and Spanish paragraphs score
+    below 0.2 against English.
+    """
+
+    def __init__(
+        self, language_code: str, *, threshold: float = DEFAULT_THRESHOLD, top_k: int = 1000
+    ) -> None:
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("language threshold must be between 0 and 1")
+        if top_k <= 0:
+            raise ValueError("top_k must be > 0")
+        self.language_code = language_code
+        self.threshold = threshold
+        self.top_k = top_k
+        self.stats = LanguageFilterStats()
+        # Loaded now so an unknown language code fails before any page is fetched.
+        words = load_language_words(language_code, top_k, option="--filter-language")
+        self._words = frozenset(words)
+
+    def score(self, word_counts: Mapping[str, int]) -> float:
+        return lang_confidence_score(word_counts, self._words)
+
+    def accepts(self, phrase: str, word_counts: Mapping[str, int]) -> bool:
+        self.stats.checked += 1
+        if self.score(word_counts) >= self.threshold:
+            return True
+        self.stats.skipped += 1
+        self.stats.skipped_phrases.append(phrase)
+        return False
+
+    def summary(self) -> str:
+        return (
+            f"Language filter ({self.language_code} >= {self.threshold:g}): "
+            f"skipped {self.stats.skipped} of {self.stats.checked} pages"
+        )
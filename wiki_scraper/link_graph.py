@@ -0,0 +1,377 @@
+"""Link graph captured while crawling, with PageRank and in-degree.
+
+Every article gets an integer node id; crawled pages contribute their
+outgoing article links. A graph directory holds:
+
+- ``nodes.json``: node phrases indexed by id and which nodes were crawled,
+- ``graph.npz``: CSR adjacency, ``indptr`` (int64, one entry per node + 1)
+  and ``indices`` (int32 target ids), or
+- ``edges.parquet``: the same edges as ``src``/``dst`` columns sorted by
+  ``src`` (``--link-graph-format parquet``, needs pyarrow).
+
+Links to pages that were never crawled are kept as nodes without outgoing
+edges, so rankings also cover the uncrawled frontier.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from wiki_scraper.utils import normalize_phrase_for_visit, write_text_atomic
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NODES_FILE = "nodes.json"
+NPZ_FILE = "graph.npz"
+PARQUET_FILE = "edges.parquet"
+GRAPH_FORMATS = ("npz", "parquet")
+RANKINGS = ("pagerank", "in-degree")
+
+# How many newly crawled pages make the cached PageRank stale during a crawl.
+PAGERANK_REFRESH_PAGES = 25
+
+
+@dataclass(frozen=True)
+class LinkGraph:
+    phrases: list[str]
+    crawled: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def node_count(self) -> int:
+        return len(self.phrases)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.indices.size)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.node_count)
+
+    def pagerank(
+        self,
+        *,
+        damping: float = 0.85,
+        tolerance: float = 1e-10,
+        max_iterations: int = 100,
+    ) -> np.ndarray:
+        """Power iteration; the rank of dangling nodes is spread uniformly."""
+
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+        out_degree = self.out_degree()
+        sources = np.repeat(np.arange(n), out_degree)
+        dangling = out_degree == 0
+        share = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            flow = np.bincount(self.indices, weights=(rank * share)[sources], minlength=n)
+            updated = (1.0 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+            converged = np.abs(updated - rank).sum() < tolerance
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def top(self, count: int = 10, *, by: str = "pagerank") -> "pd.DataFrame":
+        import pandas as pd
+
+        if count <= 0:
+            raise ValueError("count must be > 0")
+        if by not in RANKINGS:
+            raise ValueError(f"ranking must be one of: {', '.join(RANKINGS)}")
+        df = pd.DataFrame(
+            {
+                "phrase": self.phrases,
+                "pagerank": self.pagerank(),
+                "in_degree": self.in_degree(),
+                "out_degree": self.out_degree(),
+                "crawled": self.crawled,
+            }
+        )
+        column = "pagerank" if by == "pagerank" else "in_degree"
+        return df.sort_values(column, ascending=False, kind="stable").head(count).reset_index(drop=True)
+
+    def save(self, directory: str, *, graph_format: str = "npz") -> None:
+        if graph_format not in GRAPH_FORMATS:
+            raise ValueError(f"graph format must be one of: {', '.join(GRAPH_FORMATS)}")
+        root = Path(directory)
+        root.mkdir(parents=True, exist_ok=True)
+        if graph_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401  # unused, only for dependency check
+            except Exception as exc:
+                raise RuntimeError(
+                    "pyarrow is required for --link-graph-format parquet. "
+                    "Install dependencies from requirements.txt"
+                ) from exc
+            import pandas as pd
+
+            sources = np.repeat(np.arange(self.node_count, dtype=np.int32), self.out_degree())
+            edges_path = root / PARQUET_FILE
+            tmp = edges_path.with_name(edges_path.name + ".tmp")
+            pd.DataFrame({"src": sources, "dst": self.indices}).to_parquet(tmp, index=False)
+            stale_path = root / NPZ_FILE
+        else:
+            edges_path = root / NPZ_FILE
+            tmp = edges_path.with_name(edges_path.name + ".tmp")
+            with tmp.open("wb") as f:
+                np.savez_compressed(f, indptr=self.indptr, indices=self.indices)
+            stale_path = root / PARQUET_FILE
+        # Edges first, nodes.json last: a save interrupted in between leaves a
+        # node count that no longer matches the edges, which load rejects.
+        os.replace(tmp, edges_path)
+        stale_path.unlink(missing_ok=True)
+        write_text_atomic(
+            root / NODES_FILE,
+            json.dumps(
+                {"phrases": self.phrases, "crawled": self.crawled.tolist()}, ensure_ascii=True
+            ),
+        )
+
+
+def load_link_graph(directory: str) -> Optional[LinkGraph]:
+    root = Path(directory)
+    nodes_path = root / NODES_FILE
+    if not nodes_path.exists():
+        return None
+    nodes = json.loads(nodes_path.read_text(encoding="utf-8"))
+    phrases = list(nodes["phrases"])
+    crawled = np.asarray(nodes["crawled"], dtype=bool)
+
+    if (root / NPZ_FILE).exists():
+        with np.load(root / NPZ_FILE) as data:
+            indptr = data["indptr"].astype(np.int64)
+            indices = data["indices"].astype(np.int32)
+    elif (root / PARQUET_FILE).exists():
+        import pandas as pd
+
+        edges = pd.read_parquet(root / PARQUET_FILE)
+        sources = edges["src"].to_numpy(dtype=np.int64)
+        order = np.argsort(sources, kind="stable")
+        indices = edges["dst"].to_numpy(dtype=np.int32)[order]
+        out_degree = np.bincount(sources, minlength=len(phrases))
+        indptr = np.zeros(out_degree.size + 1, dtype=np.int64)
+        np.cumsum(out_degree, out=indptr[1:])
+    else:
+        raise FileNotFoundError(f"Link graph edges not found in {root}")
+    if len(indptr) != len(phrases) + 1 or (indices.size and int(indices.max()) >= len(phrases)):
+        raise ValueError(f"{NODES_FILE} in {root} does not match the saved edges")
+    return LinkGraph(phrases, crawled, indptr, indices)
+
+
+class LinkGraphBuilder:
+    """Collects the crawl's link graph; ``close`` writes it to ``directory``.
+
+    Opening an existing graph directory continues it. With ``directory=None``
+    the graph only lives in memory (used for crawl ordering).
+    """
+
+    def __init__(self, directory: Optional[str], *, graph_format: str = "npz") -> None:
+        if graph_format not in GRAPH_FORMATS:
+            raise ValueError(f"graph format must be one of: {', '.join(GRAPH_FORMATS)}")
+        self.directory = directory
+        self.graph_format = graph_format
+        self._ids: dict[str, int] = {}
+        self._phrases: list[str] = []
+        self._crawled = bytearray()
+        self._in_degree = array("i")
+        self._edges: dict[int, array] = {}
+        self._pagerank: Optional[np.ndarray] = None
+        self._pagerank_pages = 0
+        self.pagerank_version = 0
+        self.pages_added = 0
+        self.on_in_degree_change: Optional[Callable[[int], None]] = None
+
+        existing = load_link_graph(directory) if directory else None
+        if existing is not None:
+            for phrase in existing.phrases:
+                self._node(phrase)
+            self._crawled[:] = existing.crawled.astype(np.uint8).tobytes()
+            self._in_degree = array("i", existing.in_degree().astype(np.int32).tolist())
+            for src in np.flatnonzero(existing.out_degree()):
+                start, end = existing.indptr[src], existing.indptr[src + 1]
+                self._edges[int(src)] = array("i", existing.indices[start:end].tolist())
+
+    def __enter__(self) -> "LinkGraphBuilder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def node_count(self) -> int:
+        return len(self._phrases)
+
+    def _node(self, phrase: str) -> int:
+        key = normalize_phrase_for_visit(phrase)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._phrases)
+            self._phrases.append(phrase)
+            self._crawled.append(0)
+            self._in_degree.append(0)
+        return node
+
+    def add_page(self, phrase: str, targets: Iterable[str]) -> int:
+        """Record the outgoing links of a crawled page, replacing earlier ones."""
+
+        src = self._node(phrase)
+        edges = array("i")
+        seen = {src}
+        for target in targets:
+            dst = self._node(target)
+            if dst not in seen:
+                seen.add(dst)
+                edges.append(dst)
+
+        previous = self._edges.get(src, array("i"))
+        for dst in previous:
+            self._in_degree[dst] -= 1
+        for dst in edges:
+            self._in_degree[dst] += 1
+        self._edges[src] = edges
+        if self.on_in_degree_change is not None:
+            for dst in set(previous).symmetric_difference(edges):
+                self.on_in_degree_change(dst)
+        self._crawled[src] = 1
+        self.pages_added += 1
+        return src
+
+    def to_graph(self) -> LinkGraph:
+        n = self.node_count
+        out_degree = np.zeros(n, dtype=np.int64)
+        for src, edges in self._edges.items():
+            out_degree[src] = len(edges)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(out_degree, out=indptr[1:])
+        indices = np.empty(int(indptr[-1]), dtype=np.int32)
+        for src, edges in self._edges.items():
+            indices[indptr[src] : indptr[src + 1]] = np.frombuffer(edges, dtype=np.int32)
+        return LinkGraph(
+            list(self._phrases),
+            np.frombuffer(bytes(self._crawled), dtype=np.uint8).astype(bool),
+            indptr,
+            indices,
+        )
+
+    def node_id(self, phrase: str) -> int:
+        return self._node(phrase)
+
+    def refresh_pagerank(self) -> int:
+        """Recompute the cached PageRank once it is stale; returns its version."""
+
+        stale = self.pages_added - self._pagerank_pages >= PAGERANK_REFRESH_PAGES
+        if self._pagerank is None or stale:
+            self._pagerank = self.to_graph().pagerank()
+            self._pagerank_pages = self.pages_added
+            self.pagerank_version += 1
+        return self.pagerank_version
+
+    def rank(self, node: int, *, by: str) -> float:
+        """Current in-degree, or PageRank as of the last refresh (0 for newer nodes)."""
+
+        if by == "in-degree":
+            return float(self._in_degree[node])
+        if self._pagerank is None or node >= len(self._pagerank):
+            return 0.0
+        return float(self._pagerank[node])
+
+    def frontier(self, *, by: str) -> "RankedFrontier":
+        return RankedFrontier(self, by=by)
+
+    def close(self) -> None:
+        if self.directory:
+            self.to_graph().save(self.directory, graph_format=self.graph_format)
+
+
+class RankedFrontier:
+    """Crawl queue that pops the best-ranked page first; ties keep queue order.
+
+    Supports the deque operations the crawler uses (``append``, ``appendleft``,
+    ``extend``, ``popleft``, ``len`` and iteration in queue order). Entries sit
+    in a heap keyed by ``(-rank, insertion order)``. When a queued page's
+    in-degree changes a fresh entry is pushed, and when PageRank is refreshed
+    the heap is rebuilt; entries whose rank no longer matches are dropped as
+    they surface, so each pop costs O(log n).
+    """
+
+    def __init__(self, graph: LinkGraphBuilder, *, by: str) -> None:
+        if by not in RANKINGS:
+            raise ValueError(f"ranking must be one of: {', '.join(RANKINGS)}")
+        self._graph = graph
+        self._by = by
+        self._heap: list[tuple[float, int, int]] = []
+        self._items: dict[int, tuple[str, int, int]] = {}
+        self._next_seq = 0
+        self._front_seq = 0
+        self._version = -1
+        if by == "in-degree":
+            graph.on_in_degree_change = self._rescore
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        for phrase, dist, _ in sorted(self._items.values(), key=lambda item: item[2]):
+            yield phrase, dist
+
+    def _add(self, item: tuple[str, int], seq: int) -> None:
+        phrase, dist = item
+        node = self._graph.node_id(phrase)
+        if node in self._items:
+            return
+        self._items[node] = (phrase, dist, seq)
+        heapq.heappush(self._heap, (-self._graph.rank(node, by=self._by), seq, node))
+
+    def append(self, item: tuple[str, int]) -> None:
+        self._next_seq += 1
+        self._add(item, self._next_seq)
+
+    def appendleft(self, item: tuple[str, int]) -> None:
+        self._front_seq -= 1
+        self._add(item, self._front_seq)
+
+    def extend(self, items: Iterable[tuple[str, int]]) -> None:
+        for item in items:
+            self.append(item)
+
+    def _rescore(self, node: int) -> None:
+        entry = self._items.get(node)
+        if entry is not None:
+            heapq.heappush(self._heap, (-self._graph.rank(node, by=self._by), entry[2], node))
+
+    def popleft(self) -> tuple[str, int]:
+        if self._by == "pagerank":
+            version = self._graph.refresh_pagerank()
+            if version != self._version:
+                self._version = version
+                self._heap = [
+                    (-self._graph.rank(node, by=self._by), seq, node)
+                    for node, (_, _, seq) in self._items.items()
+                ]
+                heapq.heapify(self._heap)
+
+        while self._heap:
+            neg_rank, seq, node = heapq.heappop(self._heap)
+            entry = self._items.get(node)
+            if entry is None or entry[2] != seq or -neg_rank != self._graph.rank(node, by=self._by):
+                continue
+            del self._items[node]
+            return entry[0], entry[1]
+        raise IndexError("pop from an empty frontier")
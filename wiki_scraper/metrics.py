@@ -0,0 +1,164 @@
+"""Lightweight run metrics: stage timers, counters and progress lines.
+
+A process-wide registry collects timings of the pipeline stages (fetching,
+parsing, text extraction, tokenization, saving) and counters such as bytes
+fetched, retries and cache hits. The CLI writes it out at the end of a run
+as JSON or, for ``.prom`` paths, in Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, TextIO, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class StageTiming:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        self.stages: dict[str, StageTiming] = {}
+        self.started = time.perf_counter()
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.stages.clear()
+        self.started = time.perf_counter()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        timing = self.stages.get(stage)
+        if timing is None:
+            timing = self.stages[stage] = StageTiming()
+        timing.count += 1
+        timing.total_seconds += seconds
+        if seconds > timing.max_seconds:
+            timing.max_seconds = seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        derived: dict[str, float] = {}
+        tokenize = self.stages.get("tokenize")
+        if tokenize and tokenize.total_seconds > 0:
+            derived["tokens_per_second"] = self.counters.get("words.tokens", 0) / tokenize.total_seconds
+        pages = self.counters.get("crawl.pages", 0)
+        if pages and elapsed > 0:
+            derived["pages_per_second"] = pages / elapsed
+        return {
+            "elapsed_seconds": elapsed,
+            "counters": dict(sorted(self.counters.items())),
+            "stages": {
+                stage: {
+                    "count": t.count,
+                    "total_seconds": t.total_seconds,
+                    "max_seconds": t.max_seconds,
+                    "mean_seconds": t.total_seconds / t.count if t.count else 0.0,
+                }
+                for stage, t in sorted(self.stages.items())
+            },
+            "derived": derived,
+        }
+
+    def to_prometheus(self, prefix: str = "wiki_scraper") -> str:
+        lines = [
+            f"# TYPE {prefix}_elapsed_seconds gauge",
+            f"{prefix}_elapsed_seconds {time.perf_counter() - self.started:.6f}",
+        ]
+        for name, value in sorted(self.counters.items()):
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:g}")
+        if self.stages:
+            lines.append(f"# TYPE {prefix}_stage_seconds summary")
+            for stage, t in sorted(self.stages.items()):
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {t.total_seconds:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {t.count}')
+            lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+            for stage, t in sorted(self.stages.items()):
+                lines.append(f'{prefix}_stage_seconds_max{{stage="{stage}"}} {t.max_seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str) -> None:
+        p = Path(path)
+        if p.parent and str(p.parent) not in {".", ""}:
+            p.parent.mkdir(parents=True, exist_ok=True)
+        if p.suffix == ".prom":
+            p.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            p.write_text(json.dumps(self.snapshot(), indent=2) + "\n", encoding="utf-8")
+
+
+REGISTRY = Metrics()
+
+
+def incr(name: str, value: float = 1) -> None:
+    REGISTRY.incr(name, value)
+
+
+def timer(stage: str):
+    return REGISTRY.timer(stage)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator recording each call of the function as ``stage``."""
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe(stage, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class ProgressReporter:
+    """Prints a crawl progress line at most once per ``interval_seconds``."""
+
+    def __init__(self, interval_seconds: float, *, stream: TextIO | None = None) -> None:
+        self.interval_seconds = interval_seconds
+        self.stream = stream
+        self._last = time.perf_counter()
+
+    def update(self, *, pages: int, queued: int) -> None:
+        if self.interval_seconds <= 0:
+            return
+        now = time.perf_counter()
+        if now - self._last < self.interval_seconds:
+            return
+        self._last = now
+        elapsed = now - REGISTRY.started
+        fetched_mb = REGISTRY.counters.get("fetch.bytes", 0) / 1_000_000
+        rate = pages / elapsed if elapsed > 0 else 0.0
+        print(
+            f"[progress] {pages} pages, {rate:.1f} pages/s, {queued} queued, "
+            f"{fetched_mb:.1f} MB fetched, {int(REGISTRY.counters.get('fetch.retries', 0))} retries",
+            file=self.stream or sys.stderr,
+        )
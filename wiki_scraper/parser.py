@@ -2,15 +2,31 @@
 
 from __future__ import annotations
 
+import re
 from typing import Iterable, Optional
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
 
+from wiki_scraper.metrics import timed
 
+TableRows = tuple[list[list[str]], list[list[str]], list[list[str]]]
+
+_REVISION_ID_RE = re.compile(r'"wgRevisionId"\s*:\s*(\d+)')
+
+
+@timed("parse_html")
 def parse_html(html: str) -> BeautifulSoup:
     return BeautifulSoup(html, "lxml")
 
 
+def extract_revision_id(html: str) -> Optional[int]:
+    """Return the MediaWiki revision id embedded in the page config, if any."""
+
+    match = _REVISION_ID_RE.search(html)
+    return int(match.group(1)) if match else None
+
+
 def find_article_root(soup: BeautifulSoup) -> Tag:
     candidates = [
         soup.select_one("div.mw-content-ltr"),
@@ -37,6 +53,7 @@ def extract_first_paragraph_text(root: Tag) -> str:
     return ""
 
 
+@timed("get_text")
 def extract_all_text(root: Tag) -> str:
     return root.get_text(" ", strip=True)
 
@@ -52,3 +69,150 @@ def extract_links(root: Tag) -> list[str]:
 
 def extract_tables(root: Tag) -> list[Tag]:
     return list(root.find_all("table", recursive=True))
+
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _is_hidden(tag: Tag) -> bool:
+    return tag.name == "style" or "display:none" in str(tag.get("style") or "").replace(" ", "")
+
+
+def _visible_children(node: Tag, names: tuple[str, ...]) -> list[Tag]:
+    return [
+        child
+        for child in node.children
+        if isinstance(child, Tag) and child.name in names and not _is_hidden(child)
+    ]
+
+
+def _collect_text(node: Tag, parts: list[str]) -> None:
+    for child in node.children:
+        if isinstance(child, Tag):
+            if child.name == "br":
+                parts.append("\n")
+            elif not _is_hidden(child):
+                _collect_text(child, parts)
+        elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+            parts.append(str(child))
+
+
+def _cell_text(cell: Tag) -> str:
+    parts: list[str] = []
+    _collect_text(cell, parts)
+    return _RE_WHITESPACE.sub(" ", "".join(parts).strip())
+
+
+def _span(cell: Tag, attr: str) -> int:
+    try:
+        return max(1, int(str(cell.get(attr) or 1).strip()))
+    except ValueError:
+        return 1
+
+
+def _collect_rows(
+    node: Tag,
+    *,
+    in_tbody: bool,
+    in_tfoot: bool,
+    head: list[Tag],
+    body: list[Tag],
+    foot: list[Tag],
+) -> None:
+    for child in node.children:
+        if not isinstance(child, Tag) or _is_hidden(child):
+            continue
+        name = child.name
+        if name == "thead":
+            head.extend(_visible_children(child, ("tr",)))
+            if _visible_children(child, ("td", "th")):
+                head.append(child)
+        elif name == "tr":
+            if in_tbody:
+                body.append(child)
+            if in_tfoot:
+                foot.append(child)
+        _collect_rows(
+            child,
+            in_tbody=in_tbody or name == "tbody",
+            in_tfoot=in_tfoot or name == "tfoot",
+            head=head,
+            body=body,
+            foot=foot,
+        )
+
+
+def _expand_spans(
+    rows: list[Tag],
+    remainder: list[tuple[int, str, int]],
+    *,
+    overflow: bool,
+) -> tuple[list[list[str]], list[tuple[int, str, int]]]:
+    """Turn <tr> nodes into text rows, copying rowspan/colspan cells into place."""
+
+    texts_by_row: list[list[str]] = []
+    for tr in rows:
+        texts: list[str] = []
+        next_remainder: list[tuple[int, str, int]] = []
+        index = 0
+        for cell in _visible_children(tr, ("td", "th")):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            text = _cell_text(cell)
+            rowspan = _span(cell, "rowspan")
+            for _ in range(_span(cell, "colspan")):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+
+        texts_by_row.append(texts)
+        remainder = next_remainder
+
+    if not overflow:
+        while remainder:
+            next_remainder = []
+            texts = []
+            for prev_i, prev_text, prev_rowspan in remainder:
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+            texts_by_row.append(texts)
+            remainder = next_remainder
+
+    return texts_by_row, remainder
+
+
+@timed("extract_table_rows")
+def extract_table_rows(table: Tag) -> TableRows:
+    """Walk a parsed <table> once and return its (header, body, footer) text rows.
+
+    Row and cell selection, span expansion and whitespace handling follow
+    ``pandas.read_html`` so both produce the same frames.
+    """
+
+    head: list[Tag] = []
+    from_tbody: list[Tag] = []
+    foot: list[Tag] = []
+    _collect_rows(table, in_tbody=False, in_tfoot=False, head=head, body=from_tbody, foot=foot)
+    body = from_tbody + _visible_children(table, ("tr",))
+
+    if not head:
+        # Without <thead>, leading rows made only of <th> cells form the header.
+        while body and all(c.name == "th" for c in _visible_children(body[0], ("td", "th"))):
+            head.append(body.pop(0))
+
+    header_rows, rem = _expand_spans(head, [], overflow=True)
+    body_rows, rem = _expand_spans(body, rem, overflow=bool(foot))
+    footer_rows, _ = _expand_spans(foot, rem, overflow=False)
+    return header_rows, body_rows, footer_rows
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import html
+import io
+import sys
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Sequence
 
+import numpy as np
 import pandas as pd
 
+from wiki_scraper.words import load_language_words
+
 
 @dataclass(frozen=True)
 class RelativeFrequencyConfig:
@@ -18,28 +25,12 @@ class RelativeFrequencyConfig:
     language_top_k: int = 50000
 
 
-def _load_wordfreq():
-    try:
-        from wordfreq import top_n_list, word_frequency
-    except Exception as exc:
-        raise RuntimeError(
-            "wordfreq is required for --analyze-relative-word-frequency. "
-            "Install dependencies from requirements.txt"
-        ) from exc
-    return top_n_list, word_frequency
+CHART_STYLES = ("auto", "bars", "zipf", "pages")
+CHART_BAR_LIMIT = 60
+CHART_MAX_PAGES = 10
+ZIPF_LABELS = 10
 
-
-def _normalize(values: list[float | None]) -> list[float | None]:
-    non_null = [v for v in values if v is not None]
-    if not non_null:
-        return values
-    max_v = max(non_null)
-    if max_v <= 0:
-        return values
-    out: list[float | None] = []
-    for v in values:
-        out.append(None if v is None else (v / max_v))
-    return out
+_COLORS = ["#2E86AB", "#F18F01", "#A23B72", "#3B8B5A", "#C73E1D", "#6C4A9E", "#8C6D46"]
 
 
 def _ensure_parent(path: str) -> None:
@@ -48,55 +39,92 @@ def _ensure_parent(path: str) -> None:
         p.parent.mkdir(parents=True, exist_ok=True)
 
 
+def language_column(language_code: str, *, multiple: bool) -> str:
+    return f"frequency_in_{language_code}" if multiple else "frequency_in_language"
+
+
+def _load_language_frequencies(language_code: str, n: int) -> pd.Series:
+    frequencies = load_language_words(
+        language_code, n, option="--analyze-relative-word-frequency"
+    )
+    return pd.Series(
+        list(frequencies.values()),
+        index=pd.Index(list(frequencies), name="word"),
+        dtype="float64",
+    )
+
+
+def load_language_frequencies(language_codes: Sequence[str], n: int) -> dict[str, pd.Series]:
+    """Load the top ``n`` words of each language (duplicate codes load once)."""
+
+    return {code: _load_language_frequencies(code, n) for code in dict.fromkeys(language_codes)}
+
+
 def analyze_relative_word_frequency(
     word_counts: dict[str, int],
     *,
-    language_code: str,
+    language_code: str | Sequence[str],
     mode: str,
     count: int,
     chart_path: str | None = None,
+    chart_style: str = "auto",
     language_top_k: int = 50000,
 ) -> pd.DataFrame:
+    """Compare article word counts with one or more languages.
+
+    With a single language the result has the columns ``word``,
+    ``frequency_in_article`` and ``frequency_in_language``; with several it
+    has one ``frequency_in_<code>`` column per language. In ``language`` mode
+    the words are taken from the first language. All columns are normalized
+    to their maximum.
+    """
+
     if mode not in {"article", "language"}:
         raise ValueError("mode must be 'article' or 'language'")
     if count <= 0:
         raise ValueError("count must be > 0")
+    if chart_style not in CHART_STYLES:
+        raise ValueError(f"chart style must be one of: {', '.join(CHART_STYLES)}")
 
-    top_n_list, word_frequency = _load_wordfreq()
+    codes = [language_code] if isinstance(language_code, str) else list(dict.fromkeys(language_code))
+    if not codes:
+        raise ValueError("at least one language code is required")
+    multiple = len(codes) > 1
 
     lang_n = max(1000, count, language_top_k)
-    lang_words = top_n_list(language_code, lang_n)
-    lang_freq_map = {w: float(word_frequency(w, language_code)) for w in lang_words}
+    languages = load_language_frequencies(codes, lang_n)
 
+    article = pd.Series(word_counts, dtype="float64")
     if mode == "article":
-        items = sorted(word_counts.items(), key=lambda kv: kv[1], reverse=True)[:count]
-        words = [w for w, _ in items]
+        words = article.nlargest(count, keep="first").index
     else:
-        words = list(lang_words[:count])
-
-    article_freq = [float(word_counts.get(w)) if w in word_counts else None for w in words]
+        words = languages[codes[0]].index[:count]
 
-    language_freq = [lang_freq_map.get(w) for w in words]
+    columns = {"frequency_in_article": article}
+    for code in codes:
+        columns[language_column(code, multiple=multiple)] = languages[code]
+    frame = pd.concat(columns, axis=1).reindex(words)
+    maxima = frame.max().where(lambda m: m > 0, 1.0)
+    frame = frame / maxima
 
-    article_norm = _normalize(article_freq)
-    language_norm = _normalize(language_freq)
-
-    df = pd.DataFrame(
-        {
-            "word": words,
-            "frequency_in_article": article_norm,
-            "frequency_in_language": language_norm,
-        }
-    )
+    df = frame.rename_axis("word").reset_index()
+    df["word"] = df["word"].astype(str)
 
     if chart_path:
         _ensure_parent(chart_path)
-        _save_chart(df, chart_path, mode=mode, language_code=language_code)
+        df.attrs["chart_paths"] = _save_chart(
+            df, chart_path, mode=mode, language_codes=codes, style=chart_style
+        )
 
     return df
 
 
-def _save_chart(df: pd.DataFrame, chart_path: str, *, mode: str, language_code: str) -> None:
+def chart_page_path(chart_path: str, page: int) -> str:
+    p = Path(chart_path)
+    return str(p.with_name(f"{p.stem}-{page}{p.suffix}"))
+
+
+def _load_pyplot():
     try:
         import matplotlib
 
@@ -106,30 +134,124 @@ def _save_chart(df: pd.DataFrame, chart_path: str, *, mode: str, language_code:
         raise RuntimeError(
             "matplotlib is required for --chart. Install dependencies from requirements.txt"
         ) from exc
+    return plt
 
-    words = df["word"].astype(str).tolist()
-    a = df["frequency_in_article"].tolist()
-    l = df["frequency_in_language"].tolist()
-
-    x = list(range(len(words)))
-    width = 0.4
 
-    a_vals = [0.0 if v is None else float(v) for v in a]
-    l_vals = [0.0 if v is None else float(v) for v in l]
-
-    fig_w = max(10.0, min(24.0, 0.7 * len(words)))
+def _save_chart(
+    df: pd.DataFrame,
+    chart_path: str,
+    *,
+    mode: str,
+    language_codes: Sequence[str],
+    style: str = "auto",
+) -> list[str]:
+    """Render the comparison and return the written file paths.
+
+    Bars (one tick label per word) are drawn for at most ``CHART_BAR_LIMIT``
+    words; above that ``auto`` and ``bars`` draw a log-rank (Zipf) line per
+    series instead, so rendering time does not grow with ``--count``.
+    ``pages`` splits the bars over numbered files of ``CHART_BAR_LIMIT``
+    words, at most ``CHART_MAX_PAGES`` of them. The format follows the
+    extension; ``.html`` embeds an SVG.
+    """
+
+    plt = _load_pyplot()
+
+    multiple = len(language_codes) > 1
+    series = [("article", "frequency_in_article")] + [
+        (f"language ({code})", language_column(code, multiple=multiple)) for code in language_codes
+    ]
+    title = f"Relative word frequency (mode={mode})"
+
+    if style in {"auto", "bars"} and len(df) > CHART_BAR_LIMIT:
+        if style == "bars":
+            print(
+                f"{len(df)} words exceed the bar chart limit ({CHART_BAR_LIMIT}); "
+                "drawing a rank plot instead",
+                file=sys.stderr,
+            )
+        style = "zipf"
+    if style == "zipf":
+        fig = _zipf_figure(plt, df, series, title=title)
+        return [_write_figure(plt, fig, chart_path, title=title)]
+    if style == "pages" and len(df) > CHART_BAR_LIMIT:
+        if len(df) > CHART_BAR_LIMIT * CHART_MAX_PAGES:
+            print(
+                f"Charting only the first {CHART_BAR_LIMIT * CHART_MAX_PAGES} of {len(df)} words "
+                f"({CHART_MAX_PAGES} pages); use --chart-style zipf for all of them",
+                file=sys.stderr,
+            )
+            df = df.iloc[: CHART_BAR_LIMIT * CHART_MAX_PAGES]
+        paths = []
+        for page, start in enumerate(range(0, len(df), CHART_BAR_LIMIT), start=1):
+            chunk = df.iloc[start : start + CHART_BAR_LIMIT]
+            page_title = f"{title}, words {start + 1}-{start + len(chunk)}"
+            fig = _bar_figure(plt, chunk, series, title=page_title)
+            paths.append(_write_figure(plt, fig, chart_page_path(chart_path, page), title=page_title))
+        return paths
+    fig = _bar_figure(plt, df, series, title=title)
+    return [_write_figure(plt, fig, chart_path, title=title)]
+
+
+def _bar_figure(plt, df: pd.DataFrame, series: list[tuple[str, str]], *, title: str):
+    words = df["word"].astype(str).to_numpy()
+    x = np.arange(len(words))
+    width = 0.8 / len(series)
+
+    fig_w = max(10.0, min(24.0, 0.35 * len(words) * len(series)))
     fig, ax = plt.subplots(figsize=(fig_w, 6.0))
 
-    ax.bar([i - width / 2 for i in x], a_vals, width=width, label="article", color="#2E86AB")
-    ax.bar([i + width / 2 for i in x], l_vals, width=width, label=f"language ({language_code})", color="#F18F01")
+    for i, (label, column) in enumerate(series):
+        values = df[column].fillna(0.0).to_numpy(dtype=float)
+        offset = (i - (len(series) - 1) / 2) * width
+        ax.bar(x + offset, values, width=width, label=label, color=_COLORS[i % len(_COLORS)])
 
-    ax.set_title(f"Relative word frequency (mode={mode})")
+    ax.set_title(title)
     ax.set_ylabel("normalized frequency")
     ax.set_xticks(x)
     ax.set_xticklabels(words, rotation=60, ha="right")
     ax.legend()
     ax.grid(axis="y", alpha=0.25)
+    return fig
+
 
+def _zipf_figure(plt, df: pd.DataFrame, series: list[tuple[str, str]], *, title: str):
+    rank = np.arange(1, len(df) + 1)
+    fig, ax = plt.subplots(figsize=(10.0, 6.0))
+
+    for i, (label, column) in enumerate(series):
+        values = df[column].to_numpy(dtype=float)
+        mask = np.isfinite(values) & (values > 0)
+        ax.plot(rank[mask], values[mask], label=label, color=_COLORS[i % len(_COLORS)], linewidth=1.2)
+
+    article = df["frequency_in_article"].to_numpy(dtype=float)
+    for r, word, value in zip(rank[:ZIPF_LABELS], df["word"].astype(str), article[:ZIPF_LABELS]):
+        if np.isfinite(value) and value > 0:
+            ax.annotate(word, (r, value), textcoords="offset points", xytext=(3, 3), fontsize=8)
+
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_title(f"{title}, {len(df)} words")
+    ax.set_xlabel("rank")
+    ax.set_ylabel("normalized frequency")
+    ax.legend()
+    ax.grid(which="both", alpha=0.25)
+    return fig
+
+
+def _write_figure(plt, fig, path: str, *, title: str) -> str:
     fig.tight_layout()
-    fig.savefig(chart_path, dpi=160)
+    if Path(path).suffix.lower() == ".html":
+        buffer = io.StringIO()
+        fig.savefig(buffer, format="svg")
+        svg = buffer.getvalue()
+        svg = svg[svg.find("<svg") :]
+        Path(path).write_text(
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            f"</head><body>\n{svg}\n</body></html>\n",
+            encoding="utf-8",
+        )
+    else:
+        fig.savefig(path, dpi=160)
     plt.close(fig)
+    return path
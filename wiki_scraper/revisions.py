@@ -0,0 +1,184 @@
+"""Per-page revision tracking for incremental word-count refreshes.
+
+For every counted page the store keeps its revision id, ETag and the word
+counts it contributed to ``word-counts.json``. A refresh can then subtract a
+changed page's old counts and add the new ones instead of counting it twice.
+States live in ``word-counts-pages.jsonl``, one appended line per counted
+page, so tracking and refreshing cost is proportional to the pages counted.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+import requests
+
+from wiki_scraper.config import API_PATH, DEFAULT_HEADERS
+from wiki_scraper.utils import normalize_phrase, write_text_atomic
+
+DEFAULT_PAGE_STATES_PATH = "word-counts-pages.jsonl"
+
+# Stale records (older versions of re-counted pages) tolerated in the log
+# before it is compacted; compaction also waits until they outnumber live pages.
+COMPACT_MIN_STALE = 1000
+
+
+@dataclass
+class PageState:
+    phrase: str
+    revision_id: Optional[int] = None
+    etag: Optional[str] = None
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class RefreshResult:
+    checked: int = 0
+    unchanged: int = 0
+    updated: int = 0
+    failed: int = 0
+
+
+def _encode_state(key: str, state: PageState) -> str:
+    record = {
+        "key": key,
+        "phrase": state.phrase,
+        "revision_id": state.revision_id,
+        "etag": state.etag,
+        "counts": state.counts,
+    }
+    return json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n"
+
+
+def _decode_state(line: str) -> Optional[tuple[str, PageState]]:
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None  # torn last line of an interrupted append
+    if not isinstance(entry, dict):
+        return None
+    if not isinstance(entry.get("key"), str) or not isinstance(entry.get("phrase"), str):
+        return None
+    counts = {w: c for w, c in (entry.get("counts") or {}).items() if isinstance(c, int)}
+    state = PageState(
+        phrase=entry["phrase"],
+        revision_id=entry.get("revision_id"),
+        etag=entry.get("etag"),
+        counts=counts,
+    )
+    return entry["key"], state
+
+
+class PageStateLog:
+    """Append-only store of page states, one JSON line per counted page.
+
+    ``put`` appends a single record, so saving a page costs the size of that
+    page's counts rather than of every tracked page. When a page is counted
+    again its newer line wins on load; ``compact`` rewrites the file once the
+    stale lines outnumber the live ones.
+    """
+
+    def __init__(self, path: str = DEFAULT_PAGE_STATES_PATH) -> None:
+        self.path = Path(path)
+        self.states: dict[str, PageState] = {}
+        self.records = 0
+        self._needs_newline = False
+        if self.path.exists():
+            text = self.path.read_text(encoding="utf-8")
+            self._needs_newline = bool(text) and not text.endswith("\n")
+            for line in text.splitlines():
+                decoded = _decode_state(line)
+                if decoded is not None:
+                    key, state = decoded
+                    self.states[key] = state
+                    self.records += 1
+
+    def get(self, key: str) -> Optional[PageState]:
+        return self.states.get(key)
+
+    def put(self, key: str, state: PageState) -> None:
+        line = _encode_state(key, state)
+        if self._needs_newline:
+            line = "\n" + line
+            self._needs_newline = False
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+        self.states[key] = state
+        self.records += 1
+
+    def compact(self) -> bool:
+        stale = self.records - len(self.states)
+        if stale < max(COMPACT_MIN_STALE, len(self.states)):
+            return False
+        save_page_states(self.states, str(self.path))
+        self.records = len(self.states)
+        self._needs_newline = False
+        return True
+
+
+def load_page_states(path: str = DEFAULT_PAGE_STATES_PATH) -> dict[str, PageState]:
+    return PageStateLog(path).states
+
+
+def save_page_states(states: Mapping[str, PageState], path: str = DEFAULT_PAGE_STATES_PATH) -> None:
+    write_text_atomic(path, "".join(_encode_state(key, state) for key, state in states.items()))
+
+
+def fetch_revision_ids(
+    base_url: str,
+    phrases: Iterable[str],
+    *,
+    batch_size: int = 50,
+    timeout_seconds: int = 15,
+    session: Optional[requests.Session] = None,
+) -> dict[str, int]:
+    """Look up current revision ids with batched MediaWiki API queries.
+
+    Returns ``phrase -> revision id`` for pages that exist; titles are followed
+    through API normalization and redirects.
+    """
+
+    session = session or requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    api_url = base_url.rstrip("/") + API_PATH
+
+    phrases = list(phrases)
+    result: dict[str, int] = {}
+    for start in range(0, len(phrases), batch_size):
+        batch = phrases[start : start + batch_size]
+        titles = {normalize_phrase(p).replace("_", " "): p for p in batch}
+        response = session.get(
+            api_url,
+            params={
+                "action": "query",
+                "prop": "revisions",
+                "rvprop": "ids",
+                "redirects": "1",
+                "titles": "|".join(titles),
+                "format": "json",
+                "formatversion": "2",
+            },
+            timeout=timeout_seconds,
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Revision lookup failed ({response.status_code}): {api_url}")
+        query = response.json().get("query", {})
+
+        resolved = {title: title for title in titles}
+        for step in ("normalized", "redirects"):
+            mapping = {item["from"]: item["to"] for item in query.get(step, [])}
+            resolved = {src: mapping.get(dst, dst) for src, dst in resolved.items()}
+
+        revisions = {
+            page["title"]: page["revisions"][0]["revid"]
+            for page in query.get("pages", [])
+            if not page.get("missing") and page.get("revisions")
+        }
+        for title, phrase in titles.items():
+            revid = revisions.get(resolved[title])
+            if revid is not None:
+                result[phrase] = int(revid)
+    return result
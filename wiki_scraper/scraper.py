@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 from pathlib import Path
-from time import sleep
-from typing import Optional
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Optional
 
 import requests
 
+from wiki_scraper import metrics
 from wiki_scraper.config import ARTICLE_PATH_PREFIX, DEFAULT_HEADERS
 from wiki_scraper.utils import build_article_url
 
+if TYPE_CHECKING:
+    from wiki_scraper.archive import PageArchiveReader, PageArchiveWriter
+
+
+class PageNotModified(Exception):
+    """Raised when a conditional request reports the page as unchanged (HTTP 304)."""
+
 
 class Scraper:
-    """Fetches HTML content for a given wiki phrase."""
+    """Fetches HTML content for a given wiki phrase.
+
+    ``timeout_seconds`` bounds each connect/read wait of a single request;
+    ``deadline_seconds`` bounds the whole fetch including retries and backoff.
+    """
 
     def __init__(
         self,
@@ -26,6 +38,10 @@ class Scraper:
         max_retries: int = 3,
         retry_backoff_seconds: float = 1.0,
         session: Optional[requests.Session] = None,
+        archive: Optional["PageArchiveWriter"] = None,
+        replay_archive: Optional["PageArchiveReader"] = None,
+        if_none_match: Optional[str] = None,
+        deadline_seconds: Optional[float] = None,
     ) -> None:
         self.base_url = base_url
         self.phrase = phrase
@@ -36,6 +52,12 @@ class Scraper:
         self.retry_backoff_seconds = retry_backoff_seconds
         self.session = session or requests.Session()
         self.session.headers.update(DEFAULT_HEADERS)
+        self.archive = archive
+        self.replay_archive = replay_archive
+        self.if_none_match = if_none_match
+        self.deadline_seconds = deadline_seconds
+        self.etag: Optional[str] = None
+        self.bytes_fetched = 0
 
     @property
     def article_url(self) -> str:
@@ -43,8 +65,25 @@ class Scraper:
 
     def fetch_html(self) -> str:
         if self.use_local_html_file_instead:
-            return self._read_local_html()
-        return self._fetch_remote_html()
+            html = self._read_local_html()
+            self.bytes_fetched = len(html.encode("utf-8"))
+            return html
+        if self.replay_archive is not None:
+            html = self._read_archived_html()
+            self.bytes_fetched = len(html.encode("utf-8"))
+            return html
+        html = self._fetch_remote_html()
+        if self.archive is not None:
+            self.archive.write(self.article_url, html)
+        return html
+
+    def _read_archived_html(self) -> str:
+        assert self.replay_archive is not None
+        with metrics.timer("archive_read"):
+            html = self.replay_archive.read(self.article_url)
+        if html is None:
+            raise ValueError(f"Article not found in archive: {self.article_url}")
+        return html
 
     def _read_local_html(self) -> str:
         if not self.local_html_path:
@@ -55,27 +94,62 @@ class Scraper:
         return path.read_text(encoding="utf-8")
 
     def _fetch_remote_html(self) -> str:
+        with metrics.timer("fetch"):
+            return self._fetch_remote_html_with_retries()
+
+    def _fetch_remote_html_with_retries(self) -> str:
         last_status: int | None = None
         last_exc: Exception | None = None
 
+        request_kwargs = {}
+        if self.if_none_match:
+            request_kwargs["headers"] = {"If-None-Match": self.if_none_match}
+
+        deadline = None if self.deadline_seconds is None else monotonic() + self.deadline_seconds
+        timeout: float = self.timeout_seconds
+        deadline_exceeded = False
         for attempt in range(self.max_retries + 1):
+            if deadline is not None:
+                timeout = min(self.timeout_seconds, deadline - monotonic())
+                if timeout <= 0:
+                    deadline_exceeded = True
+                    break
+            metrics.incr("fetch.requests")
+            if attempt:
+                metrics.incr("fetch.retries")
             try:
-                response = self.session.get(self.article_url, timeout=self.timeout_seconds)
+                response = self.session.get(self.article_url, timeout=timeout, **request_kwargs)
                 last_status = response.status_code
             except Exception as exc:
                 last_exc = exc
                 last_status = None
             else:
+                self.bytes_fetched += len(response.content)
+                metrics.incr("fetch.bytes", len(response.content))
                 if response.status_code == 200:
+                    self.etag = response.headers.get("ETag")
                     response.encoding = response.apparent_encoding
                     return response.text
 
+                if response.status_code == 304 and self.if_none_match:
+                    self.etag = self.if_none_match
+                    raise PageNotModified(self.article_url)
+
                 if response.status_code not in {429, 500, 502, 503, 504}:
                     break
 
             if attempt < self.max_retries:
-                sleep(self.retry_backoff_seconds * (2**attempt))
+                backoff = self.retry_backoff_seconds * (2**attempt)
+                if deadline is not None and monotonic() + backoff >= deadline:
+                    deadline_exceeded = True
+                    break
+                sleep(backoff)
 
+        metrics.incr("fetch.errors")
+        if deadline_exceeded:
+            raise ValueError(
+                f"Fetch deadline exceeded ({self.deadline_seconds:g}s): {self.article_url}"
+            ) from last_exc
         if last_exc is not None:
             raise ValueError(f"Failed to fetch article: {self.article_url}") from last_exc
 
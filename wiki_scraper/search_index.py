@@ -0,0 +1,269 @@
+"""On-disk inverted index over crawled pages with BM25 ranking.
+
+An index directory holds immutable segments, one per builder flush:
+
+- ``postings-<n>.bin``: per-term postings of the segment's pages, each a
+  sequence of varint pairs ``(doc_id delta, term frequency)``,
+- ``terms-<n>.json``: ``term -> [offset, length, document frequency]``,
+
+and ``docs.json`` with page phrases, token lengths and the list of committed
+segments. ``docs.json`` is replaced atomically after a segment is written, so
+a crash mid-crawl loses at most the pages since the last flush. Indexes
+written before segments existed (a single ``postings.bin``/``terms.json``)
+are read as one segment.
+
+Queries memory-map the postings files and only decode the query terms.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Mapping
+
+from wiki_scraper.utils import write_bytes_atomic, write_text_atomic
+from wiki_scraper.words import tokenize_words
+
+POSTINGS_FILE = "postings.bin"
+TERMS_FILE = "terms.json"
+DOCS_FILE = "docs.json"
+LEGACY_SEGMENT = ""
+DEFAULT_FLUSH_PAGES = 100
+
+
+def _segment_files(segment: str) -> tuple[str, str]:
+    if segment == LEGACY_SEGMENT:
+        return POSTINGS_FILE, TERMS_FILE
+    return f"postings-{segment}.bin", f"terms-{segment}.json"
+
+
+def _load_docs(directory: Path) -> dict | None:
+    docs_path = directory / DOCS_FILE
+    if not docs_path.exists():
+        return None
+    docs = json.loads(docs_path.read_text(encoding="utf-8"))
+    if "segments" not in docs:
+        docs["segments"] = [LEGACY_SEGMENT] if (directory / TERMS_FILE).exists() else []
+    return docs
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    if value < 0:
+        raise ValueError("varint value must be >= 0")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varints(data: bytes | memoryview) -> Iterator[int]:
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value
+        value = 0
+        shift = 0
+
+
+def decode_postings(data: bytes | memoryview) -> list[tuple[int, int]]:
+    postings = []
+    doc_id = 0
+    values = decode_varints(data)
+    for delta in values:
+        doc_id += delta
+        postings.append((doc_id, next(values)))
+    return postings
+
+
+class IndexBuilder:
+    """Accumulates compressed postings page by page and flushes them as segments.
+
+    A segment is written every ``flush_pages`` pages and on ``close``. Opening
+    an existing index directory continues it, appending new doc ids.
+    """
+
+    def __init__(self, directory: str, *, flush_pages: int = DEFAULT_FLUSH_PAGES) -> None:
+        if flush_pages <= 0:
+            raise ValueError("flush_pages must be > 0")
+        self.directory = Path(directory)
+        self.flush_pages = flush_pages
+        self._postings: dict[str, bytearray] = {}
+        self._df: dict[str, int] = {}
+        self._last_doc: dict[str, int] = {}
+        self._phrases: list[str] = []
+        self._lengths: list[int] = []
+        self._segments: list[str] = []
+        self._pending = 0
+        self.pages_added = 0
+
+        docs = _load_docs(self.directory)
+        if docs is not None:
+            self._phrases = list(docs["phrases"])
+            self._lengths = list(docs["lengths"])
+            self._segments = list(docs["segments"])
+
+    def __enter__(self) -> "IndexBuilder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_page(self, phrase: str, counts: Mapping[str, int]) -> int:
+        doc_id = len(self._phrases)
+        self._phrases.append(phrase)
+        self._lengths.append(int(sum(counts.values())))
+        for term, tf in counts.items():
+            if tf <= 0:
+                continue
+            buf = self._postings.get(term)
+            if buf is None:
+                buf = self._postings[term] = bytearray()
+                previous = 0
+            else:
+                previous = self._last_doc[term]
+            encode_varint(doc_id - previous, buf)
+            encode_varint(int(tf), buf)
+            self._last_doc[term] = doc_id
+            self._df[term] = self._df.get(term, 0) + 1
+        self.pages_added += 1
+        self._pending += 1
+        if self._pending >= self.flush_pages:
+            self.flush()
+        return doc_id
+
+    def flush(self) -> None:
+        """Write pages added since the last flush as a new segment."""
+
+        if not self._pending:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segment = f"{len(self._segments):05d}"
+        postings_name, terms_name = _segment_files(segment)
+
+        terms: dict[str, list[int]] = {}
+        data = bytearray()
+        for term in sorted(self._postings):
+            buf = self._postings[term]
+            terms[term] = [len(data), len(buf), self._df[term]]
+            data += buf
+        write_bytes_atomic(self.directory / postings_name, bytes(data))
+        write_text_atomic(
+            self.directory / terms_name, json.dumps(terms, ensure_ascii=True, separators=(",", ":"))
+        )
+        # docs.json is the commit point: the segment only counts once it is listed here.
+        self._segments.append(segment)
+        write_text_atomic(
+            self.directory / DOCS_FILE,
+            json.dumps(
+                {"phrases": self._phrases, "lengths": self._lengths, "segments": self._segments},
+                ensure_ascii=True,
+            ),
+        )
+
+        self._postings.clear()
+        self._df.clear()
+        self._last_doc.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    phrase: str
+    score: float
+
+
+class _Segment:
+    def __init__(self, root: Path, segment: str) -> None:
+        postings_name, terms_name = _segment_files(segment)
+        self.terms: dict[str, list[int]] = json.loads(
+            (root / terms_name).read_text(encoding="utf-8")
+        )
+        self.file = (root / postings_name).open("rb")
+        size = self.file.seek(0, 2)
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def postings(self, term: str) -> list[tuple[int, int]]:
+        entry = self.terms.get(term)
+        if entry is None or self.mmap is None:
+            return []
+        offset, length = entry[0], entry[1]
+        return decode_postings(self.mmap[offset : offset + length])
+
+    def close(self) -> None:
+        if self.mmap is not None:
+            self.mmap.close()
+        self.file.close()
+
+
+class InvertedIndex:
+    """Read-only, memory-mapped view of an index directory."""
+
+    def __init__(self, directory: str, *, k1: float = 1.2, b: float = 0.75) -> None:
+        root = Path(directory)
+        docs = _load_docs(root)
+        if docs is None:
+            raise FileNotFoundError(f"Search index not found: {root}")
+        self.k1 = k1
+        self.b = b
+        self.phrases: list[str] = docs["phrases"]
+        self.lengths: list[int] = docs["lengths"]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+        self._segments: list[_Segment] = []
+        try:
+            for segment in docs["segments"]:
+                self._segments.append(_Segment(root, segment))
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "InvertedIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    @property
+    def document_count(self) -> int:
+        return len(self.phrases)
+
+    def postings(self, term: str) -> list[tuple[int, int]]:
+        # Segments hold consecutive doc id ranges, so concatenating keeps order.
+        postings: list[tuple[int, int]] = []
+        for segment in self._segments:
+            postings.extend(segment.postings(term))
+        return postings
+
+    def search(self, query: str, *, count: int = 10) -> list[SearchHit]:
+        if count <= 0:
+            raise ValueError("count must be > 0")
+        n_docs = self.document_count
+        avg_length = self.avg_length or 1.0
+        scores: dict[int, float] = {}
+        for term in set(tokenize_words(query)):
+            postings = self.postings(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1.0 - self.b + self.b * self.lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:count]
+        return [SearchHit(phrase=self.phrases[doc_id], score=score) for doc_id, score in ranked]
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from io import StringIO
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence, TypeVar
 
+import numpy as np
 import pandas as pd
 from bs4 import Tag
+from pandas.io.parsers import TextParser
+
+from wiki_scraper.parser import TableRows, extract_table_rows
+
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -15,7 +23,22 @@ class TableExtractionResult:
     value_counts: pd.DataFrame
 
 
-def get_nth_table(tables: list[Tag], number: int) -> Tag:
+@dataclass
+class BatchTablesResult:
+    output_path: str
+    pages: int = 0
+    tables: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    value_counts: pd.DataFrame = field(
+        default_factory=lambda: pd.DataFrame({"value": [], "count": []})
+    )
+
+
+LONG_TABLE_COLUMNS = ["page", "table", "row", "row_label", "column", "value"]
+TABLE_OUTPUT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".feather": "feather"}
+
+
+def get_nth_table(tables: Sequence[T], number: int) -> T:
     if number < 1:
         raise ValueError("Table number must be >= 1")
     if number > len(tables):
@@ -23,36 +46,145 @@ def get_nth_table(tables: list[Tag], number: int) -> Tag:
     return tables[number - 1]
 
 
-def html_table_to_dataframe(table: Tag, *, first_row_is_header: bool) -> pd.DataFrame:
-    header = 0 if first_row_is_header else None
+def _rows_to_dataframe(
+    rows: list[list[str]],
+    *,
+    header: int | list[int] | None,
+    index_col: int | None,
+) -> pd.DataFrame:
+    width = max(len(row) for row in rows)
+    padded = [row + [""] * (width - len(row)) for row in rows]
+    # TextParser is the final stage of read_html; reusing it keeps dtype inference,
+    # thousands separators, NA handling and header/index construction identical.
+    with TextParser(padded, header=header, index_col=index_col, thousands=",") as parser:
+        return parser.read()
 
-    html = str(table)
-    html_io = StringIO(html)
 
-    try:
-        frames = pd.read_html(html_io, header=header, index_col=0)
-    except ValueError:
-        html_io.seek(0)
-        frames = pd.read_html(html_io, header=header)
+def table_rows_to_dataframe(rows: TableRows, *, first_row_is_header: bool) -> pd.DataFrame:
+    header: int | list[int] | None = 0 if first_row_is_header else None
 
-    if not frames:
+    head, body, foot = rows
+    all_rows = head + body + foot
+    if not any(text for row in all_rows for text in row):
         raise ValueError("No tables could be parsed by pandas")
+    if head and header is None:
+        # Infer header from <thead> or top <th>-only rows, like read_html.
+        if len(head) == 1:
+            header = 0
+        else:
+            header = [i for i, row in enumerate(head) if any(text for text in row)]
+
+    try:
+        df = _rows_to_dataframe(all_rows, header=header, index_col=0)
+    except ValueError:
+        df = _rows_to_dataframe(all_rows, header=header, index_col=None)
 
-    df = frames[0]
     df = df.dropna(axis=0, how="all").dropna(axis=1, how="all")
     return df
 
 
-def compute_value_counts(df: pd.DataFrame) -> pd.DataFrame:
-    values = pd.Series(df.to_numpy().ravel())
+def html_table_to_dataframe(table: Tag, *, first_row_is_header: bool) -> pd.DataFrame:
+    return table_rows_to_dataframe(extract_table_rows(table), first_row_is_header=first_row_is_header)
+
+
+def _clean_values(values: pd.Series) -> pd.Series:
     values = values.dropna()
     values = values.astype(str).str.strip()
-    values = values[values != ""]
+    return values[values != ""]
+
+
+def compute_value_counts(df: pd.DataFrame) -> pd.DataFrame:
+    values = _clean_values(pd.Series(df.to_numpy().ravel()))
     counts = values.value_counts().rename_axis("value").reset_index(name="count")
     return counts
 
 
-def extract_table_result(table: Tag, *, first_row_is_header: bool) -> TableExtractionResult:
-    df = html_table_to_dataframe(table, first_row_is_header=first_row_is_header)
+def table_to_long_frame(df: pd.DataFrame, *, page: str, table_number: int) -> pd.DataFrame:
+    """Flatten a table to one row per non-empty cell, tagged with its source."""
+
+    n_rows, n_cols = df.shape
+    long = pd.DataFrame(
+        {
+            "page": page,
+            "table": table_number,
+            "row": np.repeat(np.arange(n_rows), n_cols),
+            "row_label": np.repeat(df.index.astype(str).to_numpy(), n_cols),
+            "column": np.tile(np.array([str(c) for c in df.columns], dtype=object), n_rows),
+            "value": pd.Series(df.to_numpy(dtype=object).ravel(), dtype=object),
+        },
+        columns=LONG_TABLE_COLUMNS,
+    )
+    values = _clean_values(long["value"])
+    long = long.loc[values.index]
+    long["value"] = values
+    return long.reset_index(drop=True)
+
+
+def merge_value_counts(counts: list[pd.Series]) -> pd.DataFrame:
+    non_empty = [c for c in counts if not c.empty]
+    if not non_empty:
+        return pd.DataFrame({"value": [], "count": []})
+    total = pd.concat(non_empty).groupby(level=0).sum().sort_values(ascending=False, kind="stable")
+    return total.rename_axis("value").reset_index(name="count")
+
+
+class TableBatchWriter:
+    """Writes long-format table rows to CSV (streamed) or Parquet/Feather."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        fmt = TABLE_OUTPUT_FORMATS.get(self.path.suffix.lower())
+        if fmt is None:
+            raise ValueError(
+                "Output must end with one of: " + ", ".join(sorted(TABLE_OUTPUT_FORMATS))
+            )
+        self.format = fmt
+        if fmt != "csv":
+            try:
+                import pyarrow  # noqa: F401  # unused, only for dependency check
+            except Exception as exc:
+                raise RuntimeError(
+                    f"pyarrow is required for {fmt} output. Install it or use a .csv output"
+                ) from exc
+        if self.path.parent and str(self.path.parent) not in {".", ""}:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._frames: list[pd.DataFrame] = []
+        self._csv_started = False
+
+    def write(self, long: pd.DataFrame) -> None:
+        if self.format == "csv":
+            long.to_csv(
+                self.path,
+                mode="a" if self._csv_started else "w",
+                header=not self._csv_started,
+                index=False,
+                encoding="utf-8",
+            )
+            self._csv_started = True
+        else:
+            self._frames.append(long)
+
+    def close(self) -> None:
+        if self.format == "csv":
+            if not self._csv_started:
+                pd.DataFrame(columns=LONG_TABLE_COLUMNS).to_csv(self.path, index=False)
+            return
+        frames = self._frames or [pd.DataFrame(columns=LONG_TABLE_COLUMNS)]
+        combined = pd.concat(frames, ignore_index=True).astype(
+            {"page": str, "table": "int32", "row": "int32", "row_label": str, "column": str, "value": str}
+        )
+        if self.format == "parquet":
+            combined.to_parquet(self.path, index=False)
+        else:
+            combined.to_feather(self.path)
+
+
+def extract_table_result(
+    table: Tag | TableRows,
+    *,
+    first_row_is_header: bool,
+) -> TableExtractionResult:
+    rows = extract_table_rows(table) if isinstance(table, Tag) else table
+    df = table_rows_to_dataframe(rows, first_row_is_header=first_row_is_header)
     counts = compute_value_counts(df)
     return TableExtractionResult(dataframe=df, value_counts=counts)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from urllib.parse import quote, unquote
 
 
@@ -10,6 +11,11 @@ def normalize_phrase(phrase: str) -> str:
     return "_".join(phrase.strip().split())
 
 
+def normalize_phrase_for_visit(phrase: str) -> str:
+    """Case- and whitespace-insensitive key identifying an article during a crawl."""
+    return " ".join(phrase.strip().lower().split())
+
+
 def build_article_url(base_url: str, phrase: str, prefix: str) -> str:
     """Build article URL from base URL, prefix, and phrase."""
     base = base_url.rstrip("/")
@@ -36,3 +42,23 @@ def href_to_phrase(href: str, *, prefix: str) -> str:
     raw = href[len(prefix) :].split("#", 1)[0].split("?", 1)[0]
     raw = unquote(raw)
     return raw.replace("_", " ").strip()
+
+
+def write_text_atomic(path: str | Path, text: str) -> None:
+    """Write ``text`` to a temporary sibling and rename it over ``path``.
+
+    Readers (and a crawl interrupted mid-write) see either the old or the new
+    file, never a truncated one.
+    """
+    p = Path(path)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(p)
+
+
+def write_bytes_atomic(path: str | Path, data: bytes) -> None:
+    """Binary counterpart of :func:`write_text_atomic`."""
+    p = Path(path)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(p)
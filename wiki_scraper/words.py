@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import heapq
 import json
+import math
+import sys
+import zlib
+from array import array
 from collections import Counter
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Mapping
 
+from wiki_scraper import metrics
+from wiki_scraper.metrics import timed
+from wiki_scraper.utils import write_text_atomic
 
 try:
     import regex as _re
@@ -18,19 +28,46 @@ except Exception:
     _WORD_RE = _re.compile(r"[^\W\d_]+(?:[’'][^\W\d_]+)?")
 
 
+@timed("tokenize")
 def tokenize_words(text: str) -> list[str]:
     """Tokenize text into (lowercased) words.
 
     Supports Latin letters with diacritics (e.g. pl/es/fr) and internal apostrophes.
     """
 
-    return [m.group(0).casefold() for m in _WORD_RE.finditer(text)]
+    words = [m.group(0).casefold() for m in _WORD_RE.finditer(text)]
+    metrics.incr("words.tokens", len(words))
+    return words
 
 
 def count_words(words: Iterable[str]) -> Counter[str]:
     return Counter(words)
 
 
+def load_language_words(language_code: str, n: int, *, option: str) -> dict[str, float]:
+    """Top ``n`` wordfreq words of a language mapped to their frequencies.
+
+    Frequencies come from one ``get_frequency_dict`` lookup per word rather
+    than ``word_frequency``, which re-tokenizes every word. ``option`` names
+    the CLI flag in the error raised when wordfreq is missing.
+    """
+
+    try:
+        from wordfreq import get_frequency_dict, top_n_list
+    except Exception as exc:
+        raise RuntimeError(
+            f"wordfreq is required for {option}. Install dependencies from requirements.txt"
+        ) from exc
+    try:
+        words = top_n_list(language_code, n)
+    except LookupError:
+        words = []
+    if not words:
+        raise ValueError(f"No word frequencies available for language: {language_code}")
+    frequencies = get_frequency_dict(language_code)
+    return {w: float(frequencies.get(w, 0.0)) for w in words if w}
+
+
 def load_word_counts(path: str = "word-counts.json") -> dict[str, int]:
     p = Path(path)
     if not p.exists():
@@ -47,12 +84,9 @@ def load_word_counts(path: str = "word-counts.json") -> dict[str, int]:
     return result
 
 
+@timed("save_word_counts")
 def save_word_counts(counts: dict[str, int], path: str = "word-counts.json") -> None:
-    p = Path(path)
-    p.write_text(
-        json.dumps(counts, ensure_ascii=True, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+    write_text_atomic(path, json.dumps(counts, ensure_ascii=True, indent=2, sort_keys=True) + "\n")
 
 
 def merge_word_counts(
@@ -63,3 +97,233 @@ def merge_word_counts(
     for word, count in new_counts.items():
         merged[word] = merged.get(word, 0) + int(count)
     return merged
+
+
+def subtract_word_counts(
+    existing: dict[str, int],
+    old_counts: Mapping[str, int],
+) -> dict[str, int]:
+    """Remove counts previously merged in; words that drop to zero are removed."""
+
+    result = dict(existing)
+    for word, count in old_counts.items():
+        remaining = result.get(word, 0) - int(count)
+        if remaining > 0:
+            result[word] = remaining
+        else:
+            result.pop(word, None)
+    return result
+
+
+class CountMinSketch:
+    """Fixed-size approximate counter with one-sided error.
+
+    Estimates never undercount; with probability ``1 - delta`` the overcount is at
+    most ``epsilon * total``.
+    """
+
+    def __init__(self, width: int, depth: int, *, seed: int = 0) -> None:
+        if width <= 0 or depth <= 0:
+            raise ValueError("sketch width and depth must be > 0")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self._table = array("q", bytes(8 * width * depth))
+        self._salt = seed.to_bytes(16, "little")
+
+    @classmethod
+    def from_error_bounds(cls, epsilon: float, delta: float, *, seed: int = 0) -> "CountMinSketch":
+        if not 0.0 < epsilon < 1.0 or not 0.0 < delta < 1.0:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1.0 / delta)), seed=seed)
+
+    def _cells(self, word: str) -> list[int]:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=16, salt=self._salt).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, word: str, count: int = 1) -> int:
+        """Add ``count`` occurrences and return the updated estimate."""
+
+        table = self._table
+        estimate = None
+        for cell in self._cells(word):
+            table[cell] += count
+            if estimate is None or table[cell] < estimate:
+                estimate = table[cell]
+        self.total += count
+        return int(estimate or 0)
+
+    def estimate(self, word: str) -> int:
+        table = self._table
+        return min(table[cell] for cell in self._cells(word))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Cannot merge sketches with different width, depth or seed")
+        table = self._table
+        for i, value in enumerate(other._table):
+            if value:
+                table[i] += value
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        table = array("q", self._table)
+        if sys.byteorder != "little":
+            table.byteswap()
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "seed": self.seed,
+            "total": self.total,
+            "table": base64.b64encode(zlib.compress(table.tobytes())).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        cms = cls(int(data["width"]), int(data["depth"]), seed=int(data.get("seed", 0)))
+        table = array("q")
+        table.frombytes(zlib.decompress(base64.b64decode(data["table"])))
+        if sys.byteorder != "little":
+            table.byteswap()
+        if len(table) != cms.width * cms.depth:
+            raise ValueError("Sketch table size does not match width * depth")
+        cms._table = table
+        cms.total = int(data.get("total", 0))
+        return cms
+
+
+class TopKSketch:
+    """Heavy-hitter tracker: Count-Min Sketch estimates plus a bounded candidate heap.
+
+    Memory is fixed by ``capacity`` and the sketch dimensions, independently of how
+    many distinct words are seen.
+    """
+
+    def __init__(self, capacity: int, cms: CountMinSketch) -> None:
+        if capacity <= 0:
+            raise ValueError("top-k capacity must be > 0")
+        self.capacity = capacity
+        self.cms = cms
+        self._candidates: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        top_k: int = 1000,
+        epsilon: float = 0.001,
+        delta: float = 0.01,
+        seed: int = 0,
+    ) -> "TopKSketch":
+        return cls(top_k, CountMinSketch.from_error_bounds(epsilon, delta, seed=seed))
+
+    @property
+    def total(self) -> int:
+        return self.cms.total
+
+    def update(self, word: str, count: int = 1) -> None:
+        estimate = self.cms.add(word, count)
+        candidates = self._candidates
+        if word in candidates or len(candidates) < self.capacity:
+            candidates[word] = estimate
+            heapq.heappush(self._heap, (estimate, word))
+        else:
+            min_estimate, min_word = self._peek_min()
+            if estimate <= min_estimate:
+                return
+            heapq.heappop(self._heap)
+            del candidates[min_word]
+            candidates[word] = estimate
+            heapq.heappush(self._heap, (estimate, word))
+
+        # Drop stale heap entries once they dominate the heap.
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def update_counts(self, counts: Mapping[str, int]) -> None:
+        for word, count in counts.items():
+            self.update(word, int(count))
+
+    def _peek_min(self) -> tuple[int, str]:
+        heap = self._heap
+        candidates = self._candidates
+        while heap:
+            estimate, word = heap[0]
+            if candidates.get(word) == estimate:
+                return estimate, word
+            heapq.heappop(heap)
+        raise RuntimeError("top-k heap is empty")
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(estimate, word) for word, estimate in self._candidates.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Return up to ``n`` heavy hitters with current estimates, most frequent first."""
+
+        items = [(word, self.cms.estimate(word)) for word in self._candidates]
+        items.sort(key=lambda kv: (-kv[1], kv[0]))
+        return items if n is None else items[:n]
+
+    def merge(self, other: "TopKSketch") -> None:
+        self.cms.merge(other.cms)
+        words = set(self._candidates) | set(other._candidates)
+        merged = sorted(
+            ((word, self.cms.estimate(word)) for word in words),
+            key=lambda kv: (-kv[1], kv[0]),
+        )
+        self.capacity = max(self.capacity, other.capacity)
+        self._candidates = dict(merged[: self.capacity])
+        self._rebuild_heap()
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "capacity": self.capacity,
+            "cms": self.cms.to_dict(),
+            "candidates": dict(self.top()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TopKSketch":
+        sketch = cls(int(data["capacity"]), CountMinSketch.from_dict(data["cms"]))
+        for word, estimate in data.get("candidates", {}).items():
+            if isinstance(word, str) and isinstance(estimate, int):
+                sketch._candidates[word] = estimate
+        sketch._rebuild_heap()
+        return sketch
+
+
+def load_sketch(path: str) -> TopKSketch | None:
+    p = Path(path)
+    if not p.exists():
+        return None
+    data = json.loads(p.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a JSON object")
+    return TopKSketch.from_dict(data)
+
+
+@timed("save_word_counts")
+def save_sketch(sketch: TopKSketch, path: str) -> None:
+    write_text_atomic(path, json.dumps(sketch.to_dict(), ensure_ascii=True) + "\n")
+
+
+def merge_sketches(paths: Iterable[str]) -> TopKSketch:
+    merged: TopKSketch | None = None
+    for path in paths:
+        sketch = load_sketch(path)
+        if sketch is None:
+            raise FileNotFoundError(f"Sketch file not found: {path}")
+        if merged is None:
+            merged = sketch
+        else:
+            merged.merge(sketch)
+    if merged is None:
+        raise ValueError("No sketch files given")
+    return merged